@@ -41,9 +41,20 @@ export default function App() {
     const backend = useBackend();
     const {
         gestures, detected, trainState, cameraOn, recording,
-        startCamera, stopCamera, trainModel, mlConnected, cursorMode, toggleCursorMode, updateCursorSettings
+        startCamera, stopCamera, trainModel, mlConnected, cursorMode, toggleCursorMode, updateCursorSettings,
+        setPreview, setMetricsShown
     } = backend;
 
+    // Live frames are only streamed while a view that shows them is open
+    useEffect(() => {
+        setPreview(!showLanding && (activeTab === 'Monitor' || Boolean(recording?.active)));
+    }, [showLanding, activeTab, recording?.active, setPreview]);
+
+    // Metrics are polled only while the Home or Monitor status readout is open
+    useEffect(() => {
+        setMetricsShown(!showLanding && (activeTab === 'Home' || activeTab === 'Monitor'));
+    }, [showLanding, activeTab, setMetricsShown]);
+
     // System state management based on camera and training status
     useEffect(() => {
         if (trainState?.status === 'training') {
@@ -197,7 +208,8 @@ export default function App() {
             {/* Training Overlay - Full Screen */}
             {recording?.active && recordingGesture && (
                 <TrainingOverlay
-                    liveFrame={backend.liveFrame}
+                    frameSink={backend.frameSink}
+                    hasLiveFrame={backend.hasLiveFrame}
                     recording={recording}
                     gestureName={recordingGesture.name}
                     gestureIcon={recordingGesture.icon}
@@ -220,7 +232,8 @@ export default function App() {
                     onClose={() => setShowCursorSettings(false)}
                     onTrain={handleTrainCursorGesture}
                     recording={recording}
-                    liveFrame={backend.liveFrame}
+                    frameSink={backend.frameSink}
+                    hasLiveFrame={backend.hasLiveFrame}
                     gestures={gestures}
                 />
             )}
@@ -274,7 +287,7 @@ export default function App() {
                     <div className="dashboard-container">
                         {/* System Status Banner */}
                         <div style={{ gridColumn: '1 / -1', marginBottom: '16px' }}>
-                            <SystemStatusIndicator systemState={systemState} />
+                            <SystemStatusIndicator systemState={systemState} metrics={backend.metrics} />
                         </div>
 
                         {/* Left Column (Main Feed) */}
@@ -420,7 +433,6 @@ export default function App() {
                             startRecording={backend.startRecording}
                             trainModel={backend.trainModel}
                             addToast={addToast}
-                            liveFrame={backend.liveFrame}
                         />
                     </div>
                 )}
@@ -428,16 +440,20 @@ export default function App() {
                 {activeTab === 'Monitor' && (
                     <div className="d-card" style={{ minHeight: '600px' }}>
                         <MonitorTab
-                            liveFrame={backend.liveFrame}
+                            frameSink={backend.frameSink}
+                            hasLiveFrame={backend.hasLiveFrame}
+                            cameraState={backend.cameraState}
                             detected={backend.detected}
                             cameraOn={backend.cameraOn}
                             mlConnected={backend.mlConnected}
+                            mlState={backend.mlState}
                             startCamera={backend.startCamera}
                             stopCamera={backend.stopCamera}
                             trainState={backend.trainState}
                             gestures={backend.gestures}
                             addToast={addToast}
                             systemState={systemState}
+                            metrics={backend.metrics}
                         />
                     </div>
                 )}                {activeTab === 'Cursor Control' && (
@@ -474,7 +490,8 @@ export default function App() {
                                 onClose={() => {}}
                                 onTrain={handleTrainCursorGesture}
                                 recording={recording}
-                                liveFrame={backend.liveFrame}
+                                frameSink={backend.frameSink}
+                                hasLiveFrame={backend.hasLiveFrame}
                                 gestures={gestures}
                                 embedded={true}
                             />
@@ -488,6 +505,15 @@ export default function App() {
                         {/* Settings already has internal cards, so we don't wrap it in one big card to allow grid layout */}
                         <SettingsTab
                             updateSettings={backend.updateSettings}
+                            profile={backend.profile}
+                            startProfile={backend.startProfile}
+                            stopProfile={backend.stopProfile}
+                            shadow={backend.shadow}
+                            canRollback={backend.canRollback}
+                            trainCandidate={backend.trainCandidate}
+                            promoteModel={backend.promoteModel}
+                            rollbackModel={backend.rollbackModel}
+                            discardCandidate={backend.discardCandidate}
                             addToast={addToast}
                         />
                     </div>
@@ -1,4 +1,5 @@
 import { useState } from 'react';
+import LiveFrameCanvas from './LiveFrameCanvas';
 
 const CURSOR_ACTIONS = [
     { id: 'left_click', name: 'Left Click', icon: '??', desc: 'Primary mouse button' },
@@ -8,7 +9,7 @@ const CURSOR_ACTIONS = [
     { id: 'click_select', name: 'Click-to-Select', icon: '??', desc: 'Point and click anywhere' },
 ];
 
-export default function CursorSettings({ onClose, onTrain, recording, liveFrame, gestures, embedded = false }) {
+export default function CursorSettings({ onClose, onTrain, recording, frameSink, hasLiveFrame, gestures, embedded = false }) {
     const handleTrain = (actionId) => {
         if (onTrain) {
             onTrain(actionId);
@@ -28,7 +29,7 @@ export default function CursorSettings({ onClose, onTrain, recording, liveFrame,
 
     const content = (
         <>
-            {isTraining && liveFrame && trainingGesture && (
+            {isTraining && hasLiveFrame && trainingGesture && (
                 <div className="cursor-training-preview">
                     <div className="training-preview-header">
                         <div className="training-preview-title">
@@ -38,7 +39,7 @@ export default function CursorSettings({ onClose, onTrain, recording, liveFrame,
                             {recording.recorded} / {recording.total} samples
                         </div>
                     </div>
-                    <img src={liveFrame} alt="Training preview" className="training-preview-image" />
+                    <LiveFrameCanvas frameSink={frameSink} label="Training preview" className="training-preview-image" />
                     <div className="training-preview-bar">
                         <div className="training-preview-bar-fill" style={{ width: `${(recording.recorded / recording.total) * 100}%` }} />
                     </div>
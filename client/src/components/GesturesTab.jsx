@@ -5,7 +5,7 @@ import ConfirmDialog from './ConfirmDialog';
 export default function GesturesTab({
     gestures, detected, recording, trainState,
     addGesture, deleteGesture, toggleGesture, updateGesture,
-    startRecording, trainModel, addToast, liveFrame
+    startRecording, trainModel, addToast
 }) {
     const [showAdd, setShowAdd] = useState(false);
     const [editingGesture, setEditingGesture] = useState(null);
@@ -0,0 +1,12 @@
+import React, { useEffect, useRef } from 'react';
+
+export default function LiveFrameCanvas({ frameSink, className, label }) {
+    const canvasRef = useRef(null);
+
+    useEffect(() => {
+        if (!frameSink || !canvasRef.current) return undefined;
+        return frameSink.attach(canvasRef.current);
+    }, [frameSink]);
+
+    return <canvas ref={canvasRef} className={className} role="img" aria-label={label} />;
+}
@@ -1,9 +1,10 @@
 import React from 'react';
 import SystemStatusIndicator from './SystemStatusIndicator';
+import LiveFrameCanvas from './LiveFrameCanvas';
 
 export default function MonitorTab({
-    liveFrame, detected, cameraOn, mlConnected,
-    startCamera, stopCamera, trainState, gestures, addToast, systemState
+    frameSink, hasLiveFrame, cameraState, detected, cameraOn, mlConnected, mlState,
+    startCamera, stopCamera, trainState, gestures, addToast, systemState, metrics
 }) {
     const gestureCount = Object.keys(gestures).length;
     const activeGestures = Object.values(gestures).filter(g => g.active !== false).length;
@@ -39,16 +40,21 @@ export default function MonitorTab({
 
             {/* System Status */}
             <div style={{ marginBottom: '20px' }}>
-                <SystemStatusIndicator systemState={systemState || 'PAUSED'} />
+                <SystemStatusIndicator systemState={systemState || 'PAUSED'} metrics={metrics} />
             </div>
 
             <div className="monitor-layout" style={{ marginTop: 20 }}>
                 {/* Video feed */}
                 <div className="video-container">
-                    {cameraOn && liveFrame ? (
+                    {cameraOn && hasLiveFrame ? (
                         <>
-                            <img className="video-feed" src={liveFrame} alt="Live camera feed" />
-                            {detected && (
+                            <LiveFrameCanvas className="video-feed" frameSink={frameSink} label="Live camera feed" />
+                            {cameraState === 'recovering' && (
+                                <div className="detection-pill">
+                                    <span className="detection-pill-main">Camera stalled — reconnecting…</span>
+                                </div>
+                            )}
+                            {cameraState !== 'recovering' && detected && (
                                 <div className="detection-pill">
                                     <span className="detection-pill-main">
                                         {detected.gesture} · {Math.round(detected.confidence * 100)}%
@@ -67,7 +73,9 @@ export default function MonitorTab({
                             <div className="video-placeholder-text">
                                 {!mlConnected
                                     ? 'ML service is offline — start the Python service'
-                                    : 'Click "Start Camera" to begin'}
+                                    : mlState === 'warming'
+                                        ? 'ML service is warming up…'
+                                        : 'Click "Start Camera" to begin'}
                             </div>
                         </div>
                     )}
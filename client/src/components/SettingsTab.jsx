@@ -1,9 +1,14 @@
 import React, { useState } from 'react';
 
-export default function SettingsTab({ updateSettings, addToast }) {
+export default function SettingsTab({
+    updateSettings, addToast, profile, startProfile, stopProfile,
+    shadow, canRollback, trainCandidate, promoteModel, rollbackModel, discardCandidate,
+}) {
     const [confidence, setConfidence] = useState(55);
     const [cooldown, setCooldown] = useState(1200);
     const [bufferSize, setBufferSize] = useState(6);
+    const [augmentFactor, setAugmentFactor] = useState(0);
+    const [augmentMirror, setAugmentMirror] = useState(false);
     const [autoRetrain, setAutoRetrain] = useState(false);
     const [detectionOverlay, setDetectionOverlay] = useState(true);
     const [suppressRepeated, setSuppressRepeated] = useState(true);
@@ -23,6 +28,16 @@ export default function SettingsTab({ updateSettings, addToast }) {
         updateSettings({ bufferSize: val });
     };
 
+    const handleAugmentFactor = (val) => {
+        setAugmentFactor(val);
+        updateSettings({ augmentFactor: val });
+    };
+
+    const handleAugmentMirror = (val) => {
+        setAugmentMirror(val);
+        updateSettings({ augmentMirror: val });
+    };
+
     return (
         <div>
             <div className="section-header">
@@ -90,6 +105,23 @@ export default function SettingsTab({ updateSettings, addToast }) {
                             <span className="slider-value">{bufferSize}</span>
                         </div>
                     </div>
+
+                    <div className="setting-item">
+                        <div className="setting-info">
+                            <div className="setting-label">Training Augmentation</div>
+                            <div className="setting-desc">Synthetic variants per recorded sample on retrain (fewer recordings needed)</div>
+                        </div>
+                        <div className="slider-container">
+                            <input
+                                type="range"
+                                min="0"
+                                max="8"
+                                value={augmentFactor}
+                                onChange={(e) => handleAugmentFactor(Number(e.target.value))}
+                            />
+                            <span className="slider-value">{augmentFactor ? `${augmentFactor}×` : 'Off'}</span>
+                        </div>
+                    </div>
                 </div>
 
                 {/* Feature Toggles */}
@@ -109,6 +141,17 @@ export default function SettingsTab({ updateSettings, addToast }) {
                         </label>
                     </div>
 
+                    <div className="setting-item">
+                        <div className="setting-info">
+                            <div className="setting-label">Mirror Augmentation</div>
+                            <div className="setting-desc">Also train mirrored variants so gestures work with either hand</div>
+                        </div>
+                        <label className="toggle">
+                            <input type="checkbox" checked={augmentMirror} onChange={(e) => handleAugmentMirror(e.target.checked)} />
+                            <span className="toggle-slider" />
+                        </label>
+                    </div>
+
                     <div className="setting-item">
                         <div className="setting-info">
                             <div className="setting-label">Detection Overlay</div>
@@ -168,6 +211,77 @@ export default function SettingsTab({ updateSettings, addToast }) {
                         </span>
                     </div>
 
+                    <div className="setting-item">
+                        <div className="setting-info">
+                            <div className="setting-label">Performance Profile</div>
+                            <div className="setting-desc">
+                                Sample the running ML service for 10 s to find what causes lag (camera keeps running)
+                            </div>
+                        </div>
+                        {profile?.status === 'running' ? (
+                            <button className="btn btn-secondary" onClick={stopProfile}>⏹ Stop</button>
+                        ) : (
+                            <button className="btn btn-secondary" onClick={() => startProfile(10)}>⏱ Profile</button>
+                        )}
+                    </div>
+
+                    {profile?.status === 'complete' && profile.summary && (
+                        <div className="setting-item" style={{ display: 'block' }}>
+                            <div className="setting-desc" style={{ marginBottom: 8 }}>
+                                {profile.summary.frames} frames in {profile.summary.seconds} s
+                                {profile.summary.stagesMs?.latency &&
+                                    ` · latency p95 ${profile.summary.stagesMs.latency.p95} ms`}
+                                {profile.files?.report && ` · saved to ${profile.files.report}`}
+                            </div>
+                            <div style={{ fontSize: 12, fontFamily: 'monospace', color: 'var(--text-secondary)' }}>
+                                {profile.summary.hotSpots.slice(0, 5).map((h) => (
+                                    <div key={h.function}>{h.selfMs} ms · {h.function}</div>
+                                ))}
+                            </div>
+                        </div>
+                    )}
+
+                    <div className="setting-item">
+                        <div className="setting-info">
+                            <div className="setting-label">Candidate Model</div>
+                            <div className="setting-desc">
+                                Train a new model and compare it with the active one on live gestures before switching
+                            </div>
+                        </div>
+                        <div style={{ display: 'flex', gap: 8 }}>
+                            {shadow ? (
+                                <>
+                                    <button className="btn btn-primary" onClick={promoteModel}>Promote</button>
+                                    <button className="btn btn-secondary" onClick={discardCandidate}>Discard</button>
+                                </>
+                            ) : (
+                                <button className="btn btn-secondary" onClick={trainCandidate}>🧪 Train candidate</button>
+                            )}
+                            {canRollback && (
+                                <button className="btn btn-secondary" onClick={rollbackModel}>↩ Roll back</button>
+                            )}
+                        </div>
+                    </div>
+
+                    {shadow && (
+                        <div className="setting-item" style={{ display: 'block' }}>
+                            <div className="setting-desc" style={{ marginBottom: 8 }}>
+                                {shadow.compared} live predictions in {shadow.seconds} s · candidate accuracy {shadow.candidate.accuracy}%
+                            </div>
+                            <div style={{ fontSize: 12, fontFamily: 'monospace', color: 'var(--text-secondary)' }}>
+                                <div>
+                                    agreement {shadow.agreement === null ? '—' : `${(shadow.agreement * 100).toFixed(1)}%`}
+                                </div>
+                                {['active', 'candidate'].map((name) => (
+                                    <div key={name}>
+                                        {name}: p95 {shadow.latencyMs[name].p95 ?? '—'} ms
+                                        · label changes {shadow.flipRate[name] === null ? '—' : `${(shadow.flipRate[name] * 100).toFixed(1)}%`}
+                                    </div>
+                                ))}
+                            </div>
+                        </div>
+                    )}
+
                     <div className="setting-item">
                         <div className="setting-info">
                             <div className="setting-label">PyAutoGUI Failsafe</div>
@@ -1,6 +1,25 @@
 import React from 'react';
 
-export default function SystemStatusIndicator({ systemState, className = '' }) {
+// Compact readout from the /api/metrics snapshot ({ bridge, ml })
+function metricsReadout(metrics) {
+    const ml = metrics?.ml;
+    if (!ml) return [];
+    const items = [];
+    const fps = ml.gauges?.camera_fps;
+    if (ml.gauges?.camera_on && fps) items.push(`${fps.toFixed(1)} fps`);
+    const latency = ml.histograms?.frame_latency_ms;
+    if (latency?.count && latency.p95 != null) items.push(`p95 ${latency.p95} ms`);
+    const dropped = ml.gauges?.dropped_frames;
+    if (dropped) items.push(`${dropped} dropped`);
+    const action = ml.histograms?.action_fire_latency_ms;
+    if (action?.count && action.p50 != null) items.push(`action ~${action.p50} ms`);
+    const hits = ml.gauges?.prediction_cache_hits || 0;
+    const misses = ml.gauges?.prediction_cache_misses || 0;
+    if (hits + misses) items.push(`cache ${Math.round((hits / (hits + misses)) * 100)}%`);
+    return items;
+}
+
+export default function SystemStatusIndicator({ systemState, metrics, className = '' }) {
     const getStateConfig = () => {
         switch (systemState) {
             case 'ACTIVE':
@@ -47,6 +66,7 @@ export default function SystemStatusIndicator({ systemState, className = '' }) {
     };
 
     const config = getStateConfig();
+    const readout = metricsReadout(metrics);
 
     return (
         <div className={`system-status-indicator ${className}`}>
@@ -66,6 +86,11 @@ export default function SystemStatusIndicator({ systemState, className = '' }) {
                 </span>
             </div>
             <div className="system-status-description">{config.description}</div>
+            {readout.length > 0 && (
+                <div className="system-status-metrics" title="Live runtime metrics">
+                    {readout.join(' · ')}
+                </div>
+            )}
         </div>
     );
 }
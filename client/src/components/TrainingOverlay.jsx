@@ -1,4 +1,5 @@
 import React, { useState, useEffect } from 'react';
+import LiveFrameCanvas from './LiveFrameCanvas';
 
 const TRAINING_PROMPTS = [
     { text: 'Hold gesture in center', icon: '🎯' },
@@ -12,7 +13,8 @@ const TRAINING_PROMPTS = [
 ];
 
 export default function TrainingOverlay({ 
-    liveFrame, 
+    frameSink,
+    hasLiveFrame,
     recording, 
     gestureName,
     gestureIcon,
@@ -32,6 +34,7 @@ export default function TrainingOverlay({
 
     if (!recording?.active) return null;
 
+    // Saved samples only; coverage (shown separately) can end recording early
     const progress = recording.recorded / recording.total;
     const currentPrompt = TRAINING_PROMPTS[currentPromptIndex];
     const circumference = 2 * Math.PI * 54;
@@ -42,11 +45,11 @@ export default function TrainingOverlay({
             <div className="training-overlay-content">
                 {/* Camera Feed */}
                 <div className="training-video-container">
-                    {liveFrame ? (
-                        <img 
-                            className="training-video-feed" 
-                            src={liveFrame} 
-                            alt="Training camera feed" 
+                    {hasLiveFrame ? (
+                        <LiveFrameCanvas
+                            className="training-video-feed"
+                            frameSink={frameSink}
+                            label="Training camera feed"
                         />
                     ) : (
                         <div className="training-video-placeholder">
@@ -118,6 +121,11 @@ export default function TrainingOverlay({
                             <div className="training-progress-percent">
                                 {Math.round(progress * 100)}%
                             </div>
+                            {recording.coverage > 0 && (
+                                <div className="training-progress-label">
+                                    coverage {Math.round(recording.coverage * 100)}%
+                                </div>
+                            )}
                         </div>
                     </div>
                 </div>
@@ -138,6 +146,7 @@ export default function TrainingOverlay({
                         <div className="training-tips-title">💡 Training Tips</div>
                         <ul className="training-tips-list">
                             <li>Follow the on-screen prompts to vary hand position</li>
+                            <li>Holding still adds nothing — near-duplicate frames are skipped</li>
                             <li>Keep your gesture consistent and clear</li>
                             <li>Ensure good lighting for best results</li>
                             <li>Training will complete automatically</li>
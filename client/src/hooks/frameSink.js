@@ -0,0 +1,79 @@
+/**
+ * Frame sink — paints live camera frames to canvases outside React state.
+ *
+ * Incoming frames are decoded off the main thread with createImageBitmap and
+ * drawn on the next animation frame. Only the newest frame is ever kept, so
+ * frames arriving faster than the display (or decoder) can keep up are
+ * dropped instead of queueing. Nothing is decoded while no canvas is attached.
+ */
+export function createFrameSink() {
+    const canvases = new Set();
+    const stats = { received: 0, painted: 0, dropped: 0 };
+    let pending = null;   // newest frame data URL not yet decoded
+    let bitmap = null;    // newest decoded frame not yet painted
+    let decoding = false;
+    let rafId = null;
+
+    const paint = () => {
+        rafId = null;
+        if (!bitmap) return;
+        for (const canvas of canvases) {
+            if (canvas.width !== bitmap.width) canvas.width = bitmap.width;
+            if (canvas.height !== bitmap.height) canvas.height = bitmap.height;
+            canvas.getContext('2d').drawImage(bitmap, 0, 0);
+        }
+        bitmap.close();
+        bitmap = null;
+        stats.painted++;
+    };
+
+    const decodeNext = async () => {
+        if (decoding || !pending || canvases.size === 0) return;
+        decoding = true;
+        const url = pending;
+        pending = null;
+        try {
+            const blob = await (await fetch(url)).blob();
+            const next = await createImageBitmap(blob);
+            if (bitmap) {
+                bitmap.close();
+                stats.dropped++;
+            }
+            bitmap = next;
+            if (rafId === null) rafId = requestAnimationFrame(paint);
+        } catch (e) {
+            // undecodable frame — skip it
+        } finally {
+            decoding = false;
+            decodeNext();
+        }
+    };
+
+    return {
+        stats,
+
+        push(frameUrl) {
+            stats.received++;
+            if (pending) stats.dropped++;
+            pending = frameUrl;
+            decodeNext();
+        },
+
+        attach(canvas) {
+            canvases.add(canvas);
+            decodeNext();
+            return () => canvases.delete(canvas);
+        },
+
+        clear() {
+            pending = null;
+            if (bitmap) {
+                bitmap.close();
+                bitmap = null;
+            }
+            for (const canvas of canvases) {
+                canvas.getContext('2d').clearRect(0, 0, canvas.width, canvas.height);
+            }
+        },
+    };
+}
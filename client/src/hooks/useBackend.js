@@ -1,31 +1,74 @@
 import { useState, useEffect, useRef, useCallback } from 'react';
+import { createFrameSink } from './frameSink';
 
 const WS_URL = `ws://${window.location.hostname}:3001/ws`;
 const API_URL = `http://${window.location.hostname}:3001/api`;
+const METRICS_POLL_MS = 2000;
+// Always wanted; 'preview' is added only while a live preview is on screen
+const BASE_TOPICS = ['detections', 'training', 'stats'];
 
 export function useBackend() {
     const [gestures, setGestures] = useState({});
     const [cameraOn, setCameraOn] = useState(false);
+    const [cameraState, setCameraState] = useState('stopped'); // 'running' | 'recovering' | 'stopped'
     const [mlConnected, setMlConnected] = useState(false);
-    const [liveFrame, setLiveFrame] = useState(null);
+    const [mlState, setMlState] = useState(null);
+    // Frames bypass React state: the sink paints them straight to canvases
+    const [frameSink] = useState(createFrameSink);
+    const [hasLiveFrame, setHasLiveFrame] = useState(false);
     const [detected, setDetected] = useState(null);
     const [lastDetected, setLastDetected] = useState(null);
     const [recentDetections, setRecentDetections] = useState([]);
     const [recording, setRecording] = useState(null);
     const [trainState, setTrainState] = useState({ status: 'idle', progress: 0, accuracy: 0 });
     const [stats, setStats] = useState(null);
+    const [metrics, setMetrics] = useState(null);
+    const [profile, setProfile] = useState({ status: 'idle', summary: null, files: null });
+    const [shadow, setShadow] = useState(null);
+    const [canRollback, setCanRollback] = useState(false);
     const [wsConnected, setWsConnected] = useState(false);
     const [cursorMode, setCursorMode] = useState(false);
+    // Set by the app while a live preview is mounted; the widget alone needs none
+    const [preview, setPreview] = useState(false);
+    // Set by the app while a metrics readout is on screen
+    const [metricsShown, setMetricsShown] = useState(false);
+    const [pageVisible, setPageVisible] = useState(!document.hidden);
 
     const wsRef = useRef(null);
     const reconnectTimer = useRef(null);
     const detectionTimer = useRef(null);
     const gesturesRef = useRef({});
+    const hasLiveFrameRef = useRef(false);
+
+    const resetLiveFrame = useCallback(() => {
+        hasLiveFrameRef.current = false;
+        setHasLiveFrame(false);
+        frameSink.clear();
+    }, [frameSink]);
 
     useEffect(() => {
         gesturesRef.current = gestures || {};
     }, [gestures]);
 
+    const handleDetection = useCallback((detection) => {
+        const g = gesturesRef.current?.[detection.gestureId];
+        const snapshot = {
+            ...detection,
+            icon: g?.icon || '✋',
+            action: g?.action || 'none',
+            ts: Date.now(),
+        };
+
+        setDetected(snapshot);
+        setLastDetected(snapshot);
+        setRecentDetections((prev) => {
+            const next = [snapshot, ...(prev || [])];
+            return next.slice(0, 6);
+        });
+        if (detectionTimer.current) clearTimeout(detectionTimer.current);
+        detectionTimer.current = setTimeout(() => setDetected(null), 1500);
+    }, []);
+
     const connect = useCallback(() => {
         if (wsRef.current && wsRef.current.readyState === WebSocket.OPEN) return;
 
@@ -44,10 +87,16 @@ export function useBackend() {
                     case 'connected':
                         setGestures(data.gestures || {});
                         setMlConnected(data.mlConnected || false);
+                        if (data.state) setMlState(data.state);
                         break;
 
                     case 'ml_status':
                         setMlConnected(data.connected);
+                        setMlState(data.connected ? (data.state || null) : null);
+                        break;
+
+                    case 'service_status':
+                        setMlState(data.state);
                         break;
 
                     case 'gesture_updated':
@@ -55,29 +104,26 @@ export function useBackend() {
                         break;
 
                     case 'camera_status':
+                        // Extra camera sessions are not shown in this UI
+                        if (data.session && data.session !== 'default') break;
                         setCameraOn(data.active);
+                        setCameraState(data.state || (data.active ? 'running' : 'stopped'));
+                        if (!data.active) resetLiveFrame();
                         break;
 
                     case 'frame':
-                        setLiveFrame(data.frame);
-                        if (data.detection) {
-                            const g = gesturesRef.current?.[data.detection.gestureId];
-                            const snapshot = {
-                                ...data.detection,
-                                icon: g?.icon || '✋',
-                                action: g?.action || 'none',
-                                ts: Date.now(),
-                            };
-
-                            setDetected(snapshot);
-                            setLastDetected(snapshot);
-                            setRecentDetections((prev) => {
-                                const next = [snapshot, ...(prev || [])];
-                                return next.slice(0, 6);
-                            });
-                            if (detectionTimer.current) clearTimeout(detectionTimer.current);
-                            detectionTimer.current = setTimeout(() => setDetected(null), 1500);
+                        if (data.session && data.session !== 'default') break;
+                        frameSink.push(data.frame);
+                        if (!hasLiveFrameRef.current) {
+                            hasLiveFrameRef.current = true;
+                            setHasLiveFrame(true);
                         }
+                        if (data.detection) handleDetection(data.detection);
+                        break;
+
+                    case 'detection':
+                        if (data.session && data.session !== 'default') break;
+                        handleDetection(data.detection);
                         break;
 
                     case 'recording_started':
@@ -85,7 +131,15 @@ export function useBackend() {
                         break;
 
                     case 'recording_progress':
-                        setRecording({ id: data.id, recorded: data.recorded, total: data.total, active: data.active });
+                        setRecording({
+                            id: data.id,
+                            recorded: data.recorded,
+                            total: data.total,
+                            active: data.active,
+                            coverage: data.coverage || 0,
+                            rejected: data.rejected || 0,
+                            saturated: data.saturated || false,
+                        });
                         break;
 
                     case 'recording_stopped':
@@ -103,6 +157,25 @@ export function useBackend() {
 
                     case 'stats':
                         setStats(data);
+                        if (data.canRollback !== undefined) setCanRollback(data.canRollback);
+                        break;
+
+                    case 'shadow_report':
+                        setShadow(data.report);
+                        break;
+
+                    case 'model_promoted':
+                    case 'model_rolled_back':
+                        setShadow(null);
+                        setCanRollback(data.canRollback);
+                        break;
+
+                    case 'profile_started':
+                        setProfile({ status: 'running', seconds: data.seconds, summary: null, files: null });
+                        break;
+
+                    case 'profile_complete':
+                        setProfile({ status: 'complete', summary: data.summary, files: data.files });
                         break;
 
                     case 'cursor_mode_changed':
@@ -124,14 +197,14 @@ export function useBackend() {
         ws.onclose = () => {
             console.log('[WS] Disconnected');
             setWsConnected(false);
-            setLiveFrame(null);
+            resetLiveFrame();
             reconnectTimer.current = setTimeout(connect, 3000);
         };
 
         ws.onerror = () => {
             ws.close();
         };
-    }, []);
+    }, [frameSink, resetLiveFrame, handleDetection]);
 
     useEffect(() => {
         connect();
@@ -142,6 +215,48 @@ export function useBackend() {
         };
     }, [connect]);
 
+    // Subscribe to previews only while one is shown and the page is visible
+    const wantPreview = preview && pageVisible;
+    useEffect(() => {
+        const onVisibility = () => setPageVisible(!document.hidden);
+        document.addEventListener('visibilitychange', onVisibility);
+        return () => document.removeEventListener('visibilitychange', onVisibility);
+    }, []);
+
+    useEffect(() => {
+        if (!wsConnected || !wsRef.current) return;
+        wsRef.current.send(JSON.stringify({
+            type: 'subscribe',
+            topics: wantPreview ? [...BASE_TOPICS, 'preview'] : BASE_TOPICS,
+        }));
+        if (!wantPreview) resetLiveFrame();
+    }, [wsConnected, wantPreview, resetLiveFrame]);
+
+    // Poll runtime metrics only while they are shown and the bridge is reachable
+    const pollMetrics = wsConnected && metricsShown && pageVisible;
+    useEffect(() => {
+        if (!pollMetrics) {
+            if (!wsConnected) setMetrics(null);
+            return undefined;
+        }
+        let cancelled = false;
+        const poll = async () => {
+            try {
+                const res = await fetch(`${API_URL}/metrics`);
+                const data = await res.json();
+                if (!cancelled) setMetrics(data);
+            } catch (e) {
+                // keep the last reading
+            }
+        };
+        poll();
+        const timer = setInterval(poll, METRICS_POLL_MS);
+        return () => {
+            cancelled = true;
+            clearInterval(timer);
+        };
+    }, [pollMetrics, wsConnected]);
+
     const send = useCallback((msg) => {
         if (wsRef.current && wsRef.current.readyState === WebSocket.OPEN) {
             wsRef.current.send(JSON.stringify(msg));
@@ -183,9 +298,27 @@ export function useBackend() {
     const trainModel = useCallback(() =>
         api('POST', '/train'), [api]);
 
+    const trainCandidate = useCallback(() =>
+        api('POST', '/train', { shadow: true }), [api]);
+
+    const promoteModel = useCallback(() =>
+        api('POST', '/model/promote'), [api]);
+
+    const rollbackModel = useCallback(() =>
+        api('POST', '/model/rollback'), [api]);
+
+    const discardCandidate = useCallback(() =>
+        api('POST', '/model/shadow/stop'), [api]);
+
     const updateSettings = useCallback((settings) =>
         api('POST', '/settings', settings), [api]);
 
+    const startProfile = useCallback((seconds = 10) =>
+        api('POST', '/profile/start', { seconds }), [api]);
+
+    const stopProfile = useCallback(() =>
+        api('POST', '/profile/stop'), [api]);
+
     const toggleCursorMode = useCallback(() =>
         send({ type: 'toggle_cursor_mode' }), [send]);
 
@@ -196,18 +329,27 @@ export function useBackend() {
         // State
         gestures,
         cameraOn,
+        cameraState,
         mlConnected,
+        mlState,
         wsConnected,
-        liveFrame,
+        frameSink,
+        hasLiveFrame,
         detected,
         lastDetected,
         recentDetections,
         recording,
         trainState,
         stats,
+        metrics,
+        profile,
+        shadow,
+        canRollback,
         cursorMode,
         // Actions
         send,
+        setPreview,
+        setMetricsShown,
         addGesture,
         updateGesture,
         deleteGesture,
@@ -217,7 +359,13 @@ export function useBackend() {
         startRecording,
         stopRecording,
         trainModel,
+        trainCandidate,
+        promoteModel,
+        rollbackModel,
+        discardCandidate,
         updateSettings,
+        startProfile,
+        stopProfile,
         toggleCursorMode,
         updateCursorSettings,
     };
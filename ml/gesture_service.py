@@ -1,29 +1,33 @@
 """
 GestureCtrl — Python ML Service
 Real-time hand gesture recognition + desktop control via WebSocket.
+
+Heavy dependencies (OpenCV, MediaPipe, scikit-learn, PyAutoGUI, websockets)
+are imported where they are first used so the WebSocket server can listen
+straight away while the detector and model warm up in the background.
 """
 
+import time
+
+_PROCESS_START = time.perf_counter()
+
 import asyncio
 import base64
 import functools
+import hashlib
 import json
 import logging
 import os
 import platform
-import pickle
+import struct
 import sys
-import time
+import threading
+from bisect import bisect_left
 from collections import deque
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor
 
-import cv2
 import numpy as np
-import mediapipe as mp
-import websockets
-from sklearn.neighbors import KNeighborsClassifier
-from sklearn.preprocessing import LabelEncoder
-from sklearn.model_selection import train_test_split
 
 # ---------------------------------------------------------------------------
 # Paths
@@ -33,12 +37,38 @@ DATA_DIR = BASE_DIR / "data"
 GESTURES_DIR = DATA_DIR / "gestures"
 GESTURES_JSON = DATA_DIR / "gestures.json"
 MODELS_DIR = BASE_DIR / "models"
-MODEL_PATH = MODELS_DIR / "gesture_model.pkl"
+MODEL_DIR = MODELS_DIR / "gesture_model"
+MODEL_MANIFEST = MODEL_DIR / "manifest.json"
+LEGACY_MODEL_PATH = MODELS_DIR / "gesture_model.pkl"
 META_PATH = MODELS_DIR / "gesture_meta.json"
+PROFILES_DIR = DATA_DIR / "profiles"
+FLIGHT_DIR = DATA_DIR / "flight"
 
-for d in [GESTURES_DIR, MODELS_DIR]:
+for d in [GESTURES_DIR, MODELS_DIR, MODEL_DIR]:
     d.mkdir(parents=True, exist_ok=True)
 
+# ---------------------------------------------------------------------------
+# Camera capture settings (requested from the device; it may pick the nearest)
+# ---------------------------------------------------------------------------
+CAMERA_CONFIG = {
+    "index": 0,
+    "width": 640,
+    "height": 480,
+    "fps": 30,
+    "fourcc": "MJPG",   # compressed USB transfer; "" keeps the driver default
+}
+PROCESS_SIZE = (640, 480)  # frame size fed to MediaPipe and the preview
+# Camera watchdog: a device that delivers nothing for CAMERA_STALL_SECONDS
+# (CAMERA_START_GRACE before its first frame) or fails CAMERA_MAX_FAILURES
+# grabs in a row is reopened, retrying with exponential backoff
+CAMERA_LIMITS = {"index": (0, 63), "width": (160, 7680), "height": (120, 4320), "fps": (1, 240)}
+CAMERA_STALL_SECONDS = 0.5
+CAMERA_START_GRACE = 3.0
+CAMERA_MAX_FAILURES = 10
+CAMERA_BACKOFF_MIN = 0.25
+CAMERA_BACKOFF_MAX = 5.0
+CAMERA_GRAB_WAIT = 2.0  # longest a stopped grab may take (fps can be 1) before the device counts as hung
+
 # ---------------------------------------------------------------------------
 # Logging
 # ---------------------------------------------------------------------------
@@ -108,37 +138,487 @@ def _build_action_map():
         "none":             lambda: None,
     }
 
-_build_action_map()
+# ---------------------------------------------------------------------------
+# Metrics (counters, gauges, fixed-bucket histograms)
+# ---------------------------------------------------------------------------
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 35, 50, 75, 100, 150, 250, 500, 1000)
+DISTANCE_BUCKETS = (0.05, 0.1, 0.15, 0.2, 0.3, 0.4, 0.5, 0.65, 0.8, 1.0, 1.5)
+
+
+class Counter:
+    __slots__ = ("help", "value")
+
+    def __init__(self, help=""):
+        self.help = help
+        self.value = 0
+
+    def inc(self, n=1):
+        self.value += n
+
+
+class Gauge:
+    __slots__ = ("help", "value")
+
+    def __init__(self, help=""):
+        self.help = help
+        self.value = 0.0
+
+    def set(self, value):
+        self.value = value
+
+
+class Histogram:
+    """Fixed upper-bound buckets (Prometheus ``le`` semantics, last bucket +Inf).
+
+    ``observe()`` is a bisect plus three additions — cheap enough for the
+    per-frame path. Quantiles are estimated as the upper bound of the bucket
+    that reaches them.
+    """
+
+    __slots__ = ("help", "bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds, help=""):
+        self.help = help
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        if not self.count:
+            return None
+        target, seen = q * self.count, 0
+        for bound, n in zip(self.bounds, self.counts):
+            seen += n
+            if seen >= target:
+                return bound
+        return float("inf")
+
+    def snapshot(self):
+        p95 = self.quantile(0.95)
+        return {
+            "buckets": list(self.bounds),
+            "counts": list(self.counts),
+            "sum": round(self.sum, 3),
+            "count": self.count,
+            "p50": self.quantile(0.5),
+            "p95": None if p95 == float("inf") else p95,
+        }
+
+
+class MetricsRegistry:
+    """Named metrics, created once and updated in place.
+
+    Updates take no lock: each metric is written from a single thread (the
+    event loop or a camera session's worker), and readers only need a
+    consistent-enough view. With several cameras running, the stage
+    histograms are shared between workers and may lose the odd increment.
+    Collectors registered with ``collect()`` refresh gauges that mirror
+    state owned elsewhere, right before a snapshot is taken.
+    """
+
+    def __init__(self):
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self._collectors = []
+
+    def counter(self, name, help=""):
+        return self.counters.setdefault(name, Counter(help))
+
+    def gauge(self, name, help=""):
+        return self.gauges.setdefault(name, Gauge(help))
+
+    def histogram(self, name, bounds=LATENCY_BUCKETS_MS, help=""):
+        return self.histograms.setdefault(name, Histogram(bounds, help))
+
+    def collect(self, fn):
+        self._collectors.append(fn)
+
+    def snapshot(self):
+        for fn in self._collectors:
+            try:
+                fn()
+            except Exception as e:
+                log.debug("Metrics collector failed: %s", e)
+        metrics = (self.counters, self.gauges, self.histograms)
+        return {
+            "counters": {k: c.value for k, c in self.counters.items()},
+            "gauges": {k: g.value for k, g in self.gauges.items()},
+            "histograms": {k: h.snapshot() for k, h in self.histograms.items()},
+            "help": {k: m.help for group in metrics for k, m in group.items() if m.help},
+        }
+
+
+METRICS = MetricsRegistry()
+
+# ---------------------------------------------------------------------------
+# Sampling Profiler (on-demand, all threads, no restart needed)
+# ---------------------------------------------------------------------------
+PROFILE_STAGES = ("capture", "preprocess", "detect", "encode", "classify", "broadcast")
+PROFILE_MAX_SECONDS = 120
+PROFILE_MAX_TIMELINE = 10000
+_IDLE_MODULES = ("threading.py", "queue.py", "selectors.py", "base_events.py")
+
+
+def clamp_number(value, lo, hi):
+    """``value`` as a float clamped to [lo, hi]; ValueError unless it is a finite number."""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"expected a number, got {value!r}") from None
+    if not np.isfinite(number):
+        raise ValueError(f"expected a finite number, got {value!r}")
+    return min(max(number, lo), hi)
+
+
+class SamplingProfiler:
+    """Samples every thread's Python stack every ``interval`` seconds.
+
+    A sampler thread reads ``sys._current_frames()``, so nothing is
+    instrumented and the camera keeps running at full speed; the cost is
+    bounded by the sampling rate. Samples whose innermost frame is a wait in
+    the threading/queue/selector machinery are counted as idle. The camera
+    loop adds one per-frame stage row via ``record_frame()``.
+    """
+
+    def __init__(self, interval=0.005, max_depth=64):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks = {}  # (thread_name, ((file, line, func), ...)) -> samples
+        self.idle = {}    # thread_name -> idle samples
+        self.timeline = []
+        self.started_at = None
+        self.stopped_at = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def active(self):
+        return self._thread is not None and not self._stop.is_set()
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        self.stopped_at = time.perf_counter()
+
+    def _run(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                name = names.get(ident, str(ident))
+                if frame.f_code.co_filename.endswith(_IDLE_MODULES):
+                    self.idle[name] = self.idle.get(name, 0) + 1
+                    continue
+                stack = []
+                while frame is not None and len(stack) < self.max_depth:
+                    code = frame.f_code
+                    stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                    frame = frame.f_back
+                key = (name, tuple(reversed(stack)))
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+
+    def record_frame(self, stages_ms, latency_ms):
+        if len(self.timeline) < PROFILE_MAX_TIMELINE:
+            row = {"t": round((time.perf_counter() - self.started_at) * 1000, 1)}
+            row.update(zip(PROFILE_STAGES, (round(v, 2) for v in stages_ms)))
+            row["latency"] = latency_ms
+            self.timeline.append(row)
+
+    @staticmethod
+    def _label(entry):
+        filename, line, func = entry
+        return f"{Path(filename).name}:{line}({func})"
+
+    def summary(self, top=15):
+        """Hot spots (self / inclusive time estimated from samples) and stage stats."""
+        ms = self.interval * 1000
+        own, inclusive, threads = {}, {}, {}
+        for (thread, stack), n in self.stacks.items():
+            threads[thread] = threads.get(thread, 0) + n
+            own[stack[-1]] = own.get(stack[-1], 0) + n
+            for entry in set(stack):
+                inclusive[entry] = inclusive.get(entry, 0) + n
+        hot = sorted(own.items(), key=lambda kv: kv[1], reverse=True)[:top]
+        stages = {}
+        for name in PROFILE_STAGES + ("latency",):
+            values = sorted(row[name] for row in self.timeline if name in row)
+            if values:
+                stages[name] = {
+                    "mean": round(sum(values) / len(values), 2),
+                    "p95": values[min(len(values) - 1, int(len(values) * 0.95))],
+                    "max": values[-1],
+                }
+        slowest = sorted(self.timeline, key=lambda r: r.get("latency", 0), reverse=True)[:5]
+        return {
+            "seconds": round((self.stopped_at or time.perf_counter()) - self.started_at, 2),
+            "intervalMs": ms,
+            "samples": sum(threads.values()),
+            "threads": {t: {"busyMs": round(threads.get(t, 0) * ms),
+                            "idleMs": round(self.idle.get(t, 0) * ms)}
+                        for t in sorted(set(threads) | set(self.idle))},
+            "hotSpots": [
+                {
+                    "function": self._label(entry),
+                    "selfMs": round(n * ms, 1),
+                    "totalMs": round(inclusive[entry] * ms, 1),
+                }
+                for entry, n in hot
+            ],
+            "frames": len(self.timeline),
+            "stagesMs": stages,
+            "slowestFrames": slowest,
+        }
+
+    def save(self, directory=PROFILES_DIR):
+        """Write collapsed stacks (flamegraph/speedscope) and a JSON report. Returns paths."""
+        directory.mkdir(parents=True, exist_ok=True)
+        stem = directory / time.strftime("profile_%Y%m%d_%H%M%S")
+        folded = stem.with_suffix(".folded")
+        with open(folded, "w") as f:
+            for (thread, stack), n in self.stacks.items():
+                frames = ";".join(self._label(e) for e in stack)
+                f.write(f"{thread};{frames} {n}\n")
+        report = stem.with_suffix(".json")
+        with open(report, "w") as f:
+            json.dump({"summary": self.summary(top=50), "timeline": self.timeline}, f)
+        return {"stacks": str(folded), "report": str(report)}
+
+# ---------------------------------------------------------------------------
+# Frame Pool (preallocated buffers reused across pipeline stages)
+# ---------------------------------------------------------------------------
+def current_rss_mb():
+    """Resident set size of this process in MB, or None if unavailable."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1e6
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class FramePool:
+    """Free lists of preallocated uint8 frame buffers, keyed by shape.
+
+    A stage ``acquire()``s a buffer, passes it to OpenCV as ``dst=`` and hands
+    it to the next stage; whoever consumes it last ``release()``s it. A buffer
+    is therefore never written while another stage still reads it. New arrays
+    are only allocated when a free list runs dry, which ``allocations`` counts.
+    """
+
+    def __init__(self):
+        self._free = {}
+        self._lock = threading.Lock()
+        self.allocations = 0
+        self.in_use = 0
+
+    def acquire(self, shape):
+        with self._lock:
+            free = self._free.get(shape)
+            self.in_use += 1
+            if free:
+                return free.pop()
+            self.allocations += 1
+        return np.empty(shape, dtype=np.uint8)
+
+    def adopt(self, buf):
+        """Account for a buffer OpenCV allocated itself; release() returns it to the pool."""
+        with self._lock:
+            self.allocations += 1
+            self.in_use += 1
+
+    def release(self, buf):
+        if buf is None:
+            return
+        with self._lock:
+            self.in_use -= 1
+            self._free.setdefault(buf.shape, []).append(buf)
+
+    def stats(self):
+        with self._lock:
+            pooled = sum(len(v) for v in self._free.values())
+        return {"allocations": self.allocations, "inUse": self.in_use, "pooled": pooled}
+
+# ---------------------------------------------------------------------------
+# Frame Grabber (dedicated capture thread, newest frame only)
+# ---------------------------------------------------------------------------
+class FrameGrabber:
+    """Drains a cv2.VideoCapture on its own thread and keeps only the newest frame.
+
+    Reading continuously stops OpenCV/driver buffers from handing us stale
+    frames; each frame is stamped with ``time.perf_counter()`` as soon as
+    ``grab()`` returns so latency can be measured from capture. Frames are
+    decoded into ``pool`` buffers; a frame returned by ``read()`` belongs to
+    the caller, who must ``pool.release()`` it.
+    """
+
+    def __init__(self, capture, pool):
+        self.capture = capture
+        self.pool = pool
+        self.running = False
+        self.dropped = 0      # frames replaced before anyone read them
+        self.failures = 0     # consecutive failed grabs
+        self._cond = threading.Condition()
+        self._frame = None
+        self._stamp = 0.0
+        self._seq = 0
+        self._read_seq = 0
+        self._shape = None
+        self._thread = None
+
+    def start(self):
+        self.running = True
+        self._stamp = time.perf_counter()  # stall timer runs from start
+        self._thread = threading.Thread(target=self._run, name="FrameGrabber", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """Stop grabbing; a thread stuck in a hung driver call is left to exit on its own."""
+        self.running = False
+        with self._cond:
+            # A frame nobody will read goes back to the pool
+            unread, self._frame = self._frame, None
+            self._cond.notify_all()
+        self.pool.release(unread)
+        if self._thread:
+            self._thread.join(timeout=timeout)
+
+    def join(self, timeout=None):
+        """Wait for a stopped grab thread to leave the driver. Returns whether it has."""
+        if self._thread:
+            self._thread.join(timeout)
+            return not self._thread.is_alive()
+        return True
+
+    def stalled(self):
+        """Why the device looks dead (for the watchdog), or None while it is healthy."""
+        if self.failures >= CAMERA_MAX_FAILURES:
+            return f"failed {self.failures} grabs in a row"
+        limit = CAMERA_STALL_SECONDS if self._seq else CAMERA_START_GRACE
+        idle = time.perf_counter() - self._stamp
+        if idle > limit:
+            return f"no frames for {idle:.1f} s"
+        return None
+
+    def _run(self):
+        while self.running:
+            if not self.capture.grab():
+                self.failures += 1
+                time.sleep(0.01)
+                continue
+            stamp = time.perf_counter()
+            buf = self.pool.acquire(self._shape) if self._shape else None
+            ok, frame = self.capture.retrieve(buf)
+            if not ok:
+                self.pool.release(buf)
+                self.failures += 1
+                continue
+            if frame is not buf:
+                # First frame, or the device changed mode: adopt the new shape
+                self.pool.release(buf)
+                self.pool.adopt(frame)
+                self._shape = frame.shape
+            self.failures = 0
+            with self._cond:
+                if not self.running:
+                    # stop() ran while we were in grab(); don't publish after it
+                    self.pool.release(frame)
+                    break
+                stale = None
+                if self._seq > self._read_seq:
+                    self.dropped += 1
+                    stale = self._frame
+                self._frame = frame
+                self._stamp = stamp
+                self._seq += 1
+                self._cond.notify_all()
+            self.pool.release(stale)
+
+    def read(self, timeout=0.5):
+        """Block until a frame newer than the last one read arrives.
+
+        Returns (frame, capture_stamp) or None on timeout / stop.
+        """
+        with self._cond:
+            if not self._cond.wait_for(
+                lambda: self._seq > self._read_seq or not self.running, timeout
+            ) or self._seq <= self._read_seq:
+                return None
+            self._read_seq = self._seq
+            frame, self._frame = self._frame, None
+            return frame, self._stamp
 
 # ---------------------------------------------------------------------------
 # Hand Detector (MediaPipe)
 # ---------------------------------------------------------------------------
+def normalise_landmarks(points):
+    """21 (x, y, z) landmarks → wrist-anchored, [-1, 1]-scaled 63-D float32 vector."""
+    pts = np.array(points, dtype=np.float32).reshape(21, 3)
+    pts -= pts[0]  # translate wrist to origin
+    max_val = np.max(np.abs(pts))
+    if max_val > 0:
+        pts /= max_val
+    return pts.flatten()
+
+
 class HandDetector:
     """Wraps MediaPipe Hands — extracts and normalises a 63-D landmark vector + raw landmarks."""
 
-    def __init__(self):
+    def __init__(self, static_image_mode=False):
+        import mediapipe as mp
         self.mp_hands = mp.solutions.hands
         self.mp_draw = mp.solutions.drawing_utils
         self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
+            static_image_mode=static_image_mode,
             max_num_hands=1,
             min_detection_confidence=0.7,
             min_tracking_confidence=0.6,
         )
+        self._rgb = None  # reused colour-conversion buffer
 
-    def process(self, frame):
-        """Return (landmarks_63d | None, raw_landmarks | None, annotated_frame)."""
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    def _detect(self, frame):
+        import cv2
+        if self._rgb is None or self._rgb.shape != frame.shape:
+            self._rgb = np.empty_like(frame)
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb)
         results = self.hands.process(rgb)
+        return results.multi_hand_landmarks[0] if results.multi_hand_landmarks else None
+
+    def extract(self, frame):
+        """Return the normalised 63-D vector for a BGR frame, or None (no drawing)."""
+        hand = self._detect(frame)
+        return self._normalise(hand) if hand is not None else None
 
-        if results.multi_hand_landmarks:
-            hand = results.multi_hand_landmarks[0]
+    def process(self, frame, draw=True):
+        """Return (landmarks_63d | None, raw_landmarks | None, annotated_frame)."""
+        hand = self._detect(frame)
+
+        if hand is not None:
             # Draw skeleton on frame
-            self.mp_draw.draw_landmarks(
-                frame, hand, self.mp_hands.HAND_CONNECTIONS,
-                self.mp_draw.DrawingSpec(color=(0, 255, 178), thickness=2, circle_radius=3),
-                self.mp_draw.DrawingSpec(color=(0, 200, 150), thickness=2),
-            )
+            if draw:
+                self.mp_draw.draw_landmarks(
+                    frame, hand, self.mp_hands.HAND_CONNECTIONS,
+                    self.mp_draw.DrawingSpec(color=(0, 255, 178), thickness=2, circle_radius=3),
+                    self.mp_draw.DrawingSpec(color=(0, 200, 150), thickness=2),
+                )
             landmarks = self._normalise(hand)
             raw_landmarks = [[lm.x, lm.y, lm.z] for lm in hand.landmark]
             return landmarks, raw_landmarks, frame
@@ -147,12 +627,7 @@ class HandDetector:
     @staticmethod
     def _normalise(hand):
         """Anchor to wrist, scale to [-1, 1] → 63-element float32 array."""
-        pts = np.array([[lm.x, lm.y, lm.z] for lm in hand.landmark], dtype=np.float32)
-        pts -= pts[0]  # translate wrist to origin
-        max_val = np.max(np.abs(pts))
-        if max_val > 0:
-            pts /= max_val
-        return pts.flatten()
+        return normalise_landmarks([[lm.x, lm.y, lm.z] for lm in hand.landmark])
 
     def close(self):
         self.hands.close()
@@ -469,62 +944,636 @@ class CursorController:
         
         return False
 
+# ---------------------------------------------------------------------------
+# Prediction Cache (temporal memoisation)
+# ---------------------------------------------------------------------------
+class PredictionCache:
+    """Reuses the last prediction while the hand is held (nearly) still.
+
+    A lookup hits when the new vector is within ``tolerance`` (L2) of the last
+    vector that actually went through the classifier, the threshold is the same
+    and the cached result is younger than ``max_age`` seconds.
+    """
+
+    def __init__(self, tolerance=0.02, max_age=0.25):
+        self.tolerance = tolerance
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.invalidate()
+
+    def invalidate(self):
+        self._vector = None
+        self._threshold = None
+        self._result = None
+        self._stamp = 0.0
+
+    def lookup(self, vector, threshold):
+        """Return the cached (label, confidence) or None on a miss."""
+        if self._vector is not None and threshold == self._threshold:
+            if time.monotonic() - self._stamp <= self.max_age:
+                diff = vector - self._vector
+                if float(np.dot(diff, diff)) <= self.tolerance * self.tolerance:
+                    self.hits += 1
+                    return self._result
+        self.misses += 1
+        return None
+
+    def store(self, vector, threshold, result):
+        self._vector = np.array(vector, dtype=np.float32, copy=True)
+        self._threshold = threshold
+        self._result = result
+        self._stamp = time.monotonic()
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hit_rate, 3),
+        }
+
+# ---------------------------------------------------------------------------
+# KNN Model (versioned, memory-mapped on-disk format)
+# ---------------------------------------------------------------------------
+MODEL_FORMAT = "gesturectrl-knn"
+MODEL_FORMAT_VERSION = 2  # v2: per-class rejection thresholds
+
+DEFAULT_REJECT_DIST = 0.65  # global outlier cut-off for models without per-class thresholds
+
+
+def gesture_meta_hash(gesture_map):
+    """Stable hash of the gesture ids/names a model was trained against."""
+    pairs = sorted((gid, info.get("name", gid)) for gid, info in gesture_map.items())
+    return hashlib.sha1(json.dumps(pairs).encode("utf-8")).hexdigest()[:16]
+
+
+class KNNModel:
+    """Brute-force K-Nearest Neighbours over a raw training matrix.
+
+    The matrix, labels and squared row norms are plain ``.npy`` arrays so a
+    saved model is opened with ``mmap_mode="r"`` instead of being unpickled —
+    load time no longer grows with the number of samples.
+    """
+
+    def __init__(self, X, y, classes, n_neighbors=5, weights="distance",
+                 accuracy=0.0, meta_hash=None, sq_norms=None,
+                 class_thresholds=None, reject_dist=DEFAULT_REJECT_DIST, search=None):
+        self.X = X
+        self.y = y
+        self.classes = list(classes)
+        self.n_neighbors = int(n_neighbors)
+        self.weights = weights
+        self.accuracy = float(accuracy)
+        self.meta_hash = meta_hash
+        self.class_thresholds = class_thresholds
+        self.reject_dist = float(reject_dist)
+        self.search = search or {}
+        if sq_norms is None:
+            sq_norms = np.einsum("ij,ij->i", X, X).astype(np.float32)
+        self.sq_norms = sq_norms
+
+    def __len__(self):
+        return len(self.y)
+
+    def kneighbors(self, Q, n_neighbors=None):
+        """Return (distances, indices), each of shape (len(Q), k), nearest first."""
+        Q = np.atleast_2d(np.asarray(Q, dtype=np.float32))
+        k = min(n_neighbors or self.n_neighbors, len(self.y))
+        d2 = Q @ self.X.T
+        d2 *= -2.0
+        d2 += self.sq_norms
+        d2 += np.einsum("ij,ij->i", Q, Q)[:, None]
+        np.maximum(d2, 0.0, out=d2)
+        if k < d2.shape[1]:
+            idx = np.argpartition(d2, k - 1, axis=1)[:, :k]
+        else:
+            idx = np.broadcast_to(np.arange(d2.shape[1]), d2.shape).copy()
+        part = np.take_along_axis(d2, idx, axis=1)
+        order = np.argsort(part, axis=1)
+        idx = np.take_along_axis(idx, order, axis=1)
+        dist = np.sqrt(np.take_along_axis(part, order, axis=1))
+        return dist, idx
+
+    def proba_from_neighbors(self, dist, idx):
+        """Class probabilities (len(dist), n_classes) from neighbour results."""
+        if self.weights == "distance":
+            with np.errstate(divide="ignore"):
+                w = 1.0 / dist
+            exact = np.isinf(w)
+            rows = exact.any(axis=1)
+            w[rows] = exact[rows]
+        else:
+            w = np.ones_like(dist)
+        labels = np.asarray(self.y)[idx]
+        proba = np.zeros((len(dist), len(self.classes)), dtype=np.float64)
+        np.add.at(proba, (np.arange(len(dist))[:, None], labels), w)
+        proba /= proba.sum(axis=1, keepdims=True)
+        return proba
+
+    def decide(self, dist, idx, min_confidence=0.0):
+        """Vote and reject in one vectorised pass over neighbour results.
+
+        Returns (class_idx, confidence) arrays; class_idx is -1 when the row is
+        rejected — too far from its predicted class (per-class threshold, or
+        ``reject_dist`` from any sample for older models) or below
+        ``min_confidence``.
+        """
+        proba = self.proba_from_neighbors(dist, idx)
+        rows = np.arange(len(dist))
+        best = np.argmax(proba, axis=1)
+        confidence = proba[rows, best]
+        if self.class_thresholds is not None:
+            same = np.asarray(self.y)[idx] == best[:, None]
+            nearest_same = np.where(same, dist, np.inf).min(axis=1)
+            accepted = nearest_same <= np.asarray(self.class_thresholds)[best]
+        else:
+            accepted = dist[:, 0] <= self.reject_dist
+        accepted &= confidence >= min_confidence
+        return np.where(accepted, best, -1), confidence
+
+    def predict(self, Q):
+        dist, idx = self.kneighbors(Q)
+        return np.argmax(self.proba_from_neighbors(dist, idx), axis=1)
+
+    def warm(self):
+        """Fault memory-mapped arrays in so the first live query isn't slowed."""
+        self.kneighbors(np.zeros((1, self.X.shape[1]), dtype=np.float32))
+        return self
+
+    def save(self, directory=MODEL_DIR):
+        """Write arrays under a fresh generation name, then swap the manifest.
+
+        Readers holding a memory map of the previous generation keep working;
+        stale array files are removed once nothing references them.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        gen = f"{int(time.time() * 1000):x}"
+        arrays = {
+            "X": np.ascontiguousarray(self.X, dtype=np.float32),
+            "y": np.ascontiguousarray(self.y, dtype=np.int32),
+            "sq_norms": np.ascontiguousarray(self.sq_norms, dtype=np.float32),
+        }
+        if self.class_thresholds is not None:
+            arrays["class_thresholds"] = np.ascontiguousarray(self.class_thresholds, dtype=np.float32)
+        files = {}
+        for name, arr in arrays.items():
+            files[name] = f"{name}_{gen}.npy"
+            np.save(str(directory / files[name]), arr, allow_pickle=False)
+
+        manifest = {
+            "format": MODEL_FORMAT,
+            "version": MODEL_FORMAT_VERSION,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "arrays": files,
+            "classes": self.classes,
+            "params": {
+                "n_neighbors": self.n_neighbors,
+                "weights": self.weights,
+                "reject_dist": self.reject_dist,
+            },
+            "search": self.search,
+            "accuracy": self.accuracy,
+            "metaHash": self.meta_hash,
+            "nSamples": int(len(self.y)),
+        }
+        tmp = directory / "manifest.json.tmp"
+        with open(tmp, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp, directory / "manifest.json")
+        self._remove_stale_arrays(directory, set(files.values()))
+
+    @staticmethod
+    def _remove_stale_arrays(directory, keep):
+        for f in directory.glob("*.npy"):
+            if f.name not in keep:
+                try:
+                    f.unlink()
+                except OSError:
+                    pass  # still mapped (Windows) — retried on the next save
+
+    @classmethod
+    def load(cls, directory=MODEL_DIR):
+        """Open a saved model; arrays are memory-mapped read-only."""
+        directory = Path(directory)
+        with open(directory / "manifest.json", "r") as f:
+            manifest = json.load(f)
+        if manifest.get("format") != MODEL_FORMAT:
+            raise ValueError(f"not a {MODEL_FORMAT} model")
+        if manifest.get("version", 0) > MODEL_FORMAT_VERSION:
+            raise ValueError(f"model format v{manifest['version']} is newer than supported")
+        arrays = {
+            name: np.load(str(directory / fname), mmap_mode="r", allow_pickle=False)
+            for name, fname in manifest["arrays"].items()
+        }
+        params = manifest.get("params", {})
+        return cls(
+            arrays["X"], arrays["y"], manifest["classes"],
+            n_neighbors=params.get("n_neighbors", 5),
+            weights=params.get("weights", "distance"),
+            accuracy=manifest.get("accuracy", 0.0),
+            meta_hash=manifest.get("metaHash"),
+            sq_norms=arrays.get("sq_norms"),
+            class_thresholds=arrays.get("class_thresholds"),
+            reject_dist=params.get("reject_dist", DEFAULT_REJECT_DIST),
+            search=manifest.get("search"),
+        )
+
+    @classmethod
+    def from_legacy_pickle(cls, path=LEGACY_MODEL_PATH):
+        """Convert a pickled sklearn KNeighborsClassifier + LabelEncoder."""
+        import pickle
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        knn, encoder = data["model"], data["encoder"]
+        return cls(
+            np.asarray(knn._fit_X, dtype=np.float32),
+            np.asarray(knn.classes_)[knn._y].astype(np.int32),
+            [str(c) for c in encoder.classes_],
+            n_neighbors=knn.n_neighbors,
+            weights=knn.weights if knn.weights in ("distance", "uniform") else "distance",
+            accuracy=data.get("accuracy", 0.0),
+        )
+
+# ---------------------------------------------------------------------------
+# Hyperparameter search helpers (module level so worker processes can import them)
+# ---------------------------------------------------------------------------
+SEARCH_GRID = {
+    "n_neighbors": (1, 3, 5, 7, 9),
+    "weights": ("distance", "uniform"),
+    "reject_quantile": (0.9, 0.95, 0.99),   # of each class's own NN-distance distribution
+    "reject_margin": (1.0, 1.25, 1.5, 2.0),  # multiplier on that quantile
+}
+SEARCH_MIN_CONFIDENCE = 0.55        # confidence used when scoring candidates
+SEARCH_FALSE_ACCEPT_WEIGHT = 0.5    # score = accuracy - weight * false-accept rate
+# Scores this close to the best count as a tie; ties go to the largest k, then
+# the widest rejection threshold. k=1 votes are one-hot (confidence always
+# 1.0), which would make the confidence threshold a no-op.
+SEARCH_TIE_EPSILON = 0.005
+SEARCH_TIE_BREAK = "largest n_neighbors, then widest reject threshold"
+PARALLEL_SEARCH_MIN_SAMPLES = 1500  # below this, worker start-up costs more than it saves
+
+
+def within_class_nn_distances(X, y, n_classes):
+    """Per class, each sample's distance to its nearest other same-class sample."""
+    out = []
+    for c in range(n_classes):
+        Xc = X[y == c]
+        if len(Xc) < 2:
+            out.append(np.empty(0, dtype=np.float32))
+            continue
+        sq = np.einsum("ij,ij->i", Xc, Xc)
+        d2 = sq[:, None] + sq[None, :] - 2.0 * (Xc @ Xc.T)
+        np.fill_diagonal(d2, np.inf)
+        out.append(np.sqrt(np.maximum(d2.min(axis=1), 0.0)).astype(np.float32))
+    return out
+
+
+def class_thresholds_from(nn_dists, quantile, margin, fallback=DEFAULT_REJECT_DIST):
+    """Per-class rejection distance: ``margin`` × ``quantile`` of the class's NN distances."""
+    return np.array([
+        max(float(np.quantile(d, quantile)) * margin, 1e-3) if len(d) else fallback
+        for d in nn_dists
+    ], dtype=np.float32)
+
+
+def between_class_blends(X, y, n, rng):
+    """Synthetic negatives: midpoints of different-gesture pairs, re-normalised.
+
+    These stand in for transitional poses between gestures, which is where
+    false fires come from; a good rejection setting should refuse them.
+    """
+    if len(np.unique(y)) < 2 or n <= 0:
+        return np.empty((0, X.shape[1]), dtype=np.float32)
+    a = rng.integers(0, len(X), size=n * 3)
+    b = rng.integers(0, len(X), size=n * 3)
+    keep = y[a] != y[b]
+    a, b = a[keep][:n], b[keep][:n]
+    blends = 0.5 * (X[a] + X[b])
+    scale = np.abs(blends).max(axis=1, keepdims=True)
+    scale[scale == 0] = 1.0
+    return (blends / scale).astype(np.float32)
+
+
+AUGMENT_MAX_FACTOR = 20  # variants per sample; the training set grows (1 + factor)×
+
+
+def augment_factor(value):
+    """A requested augmentation factor as an int in [0, AUGMENT_MAX_FACTOR]; ValueError if not numeric."""
+    try:
+        return min(max(int(value), 0), AUGMENT_MAX_FACTOR)
+    except (TypeError, ValueError):
+        raise ValueError(f"augment must be a number, got {value!r}") from None
+
+
+def augment_samples(X, y, factor, rng, mirror=False, max_rotation=0.25,
+                    axis_scale=0.08, noise=0.01):
+    """Generate ``factor`` perturbed copies of each normalised 63-D sample.
+
+    All variants are built in one batch: a random small 3-D rotation
+    (Rodrigues, up to ``max_rotation`` rad), per-axis scale jitter, landmark
+    noise and — with ``mirror`` — an x-flip on a random half to mimic the
+    other hand. Results are re-anchored at the wrist and rescaled to [-1, 1]
+    like ``HandDetector._normalise``. Returns (X_aug, y_aug), originals excluded.
+    """
+    if factor <= 0 or len(X) == 0:
+        return np.empty((0, X.shape[1]), dtype=np.float32), np.empty(0, dtype=y.dtype)
+    pts = np.repeat(X.reshape(-1, 21, 3), factor, axis=0).astype(np.float32)
+    y_aug = np.repeat(y, factor)
+    m = len(pts)
+
+    axis = rng.normal(size=(m, 3))
+    axis /= np.linalg.norm(axis, axis=1, keepdims=True)
+    theta = rng.uniform(-max_rotation, max_rotation, size=(m, 1, 1))
+    K = np.zeros((m, 3, 3))
+    K[:, 0, 1], K[:, 0, 2] = -axis[:, 2], axis[:, 1]
+    K[:, 1, 0], K[:, 1, 2] = axis[:, 2], -axis[:, 0]
+    K[:, 2, 0], K[:, 2, 1] = -axis[:, 1], axis[:, 0]
+    R = np.eye(3) + np.sin(theta) * K + (1 - np.cos(theta)) * (K @ K)
+    pts = np.einsum("mij,mkj->mki", R.astype(np.float32), pts)
+
+    pts *= rng.uniform(1 - axis_scale, 1 + axis_scale, size=(m, 1, 3)).astype(np.float32)
+    pts += rng.normal(0.0, noise, size=pts.shape).astype(np.float32)
+    if mirror:
+        pts[rng.random(m) < 0.5, :, 0] *= -1
+
+    pts -= pts[:, :1, :]
+    scale = np.abs(pts).reshape(m, -1).max(axis=1)
+    scale[scale == 0] = 1.0
+    pts /= scale[:, None, None]
+    return pts.reshape(m, -1), y_aug
+
+
+def with_augmentation(X, y, augment, rng):
+    """Training matrix with augmented variants appended (``augment``: factor/mirror dict)."""
+    factor = int((augment or {}).get("factor", 0))
+    if factor <= 0:
+        return X, y
+    X_aug, y_aug = augment_samples(X, y, factor, rng, mirror=bool(augment.get("mirror")))
+    return np.concatenate([X, X_aug]), np.concatenate([y, y_aug])
+
+
+def search_candidates(max_k):
+    return [
+        (k, w, q, m)
+        for k in SEARCH_GRID["n_neighbors"] if k <= max_k
+        for w in SEARCH_GRID["weights"]
+        for q in SEARCH_GRID["reject_quantile"]
+        for m in SEARCH_GRID["reject_margin"]
+    ]
+
+
+def cv_fold_scores(task):
+    """Score every candidate on one CV fold. Returns a list aligned with ``candidates``.
+
+    The fold's training part is augmented here (never its validation part);
+    rejection thresholds are calibrated on the real samples only, since
+    augmented near-copies would shrink the neighbour distances.
+    """
+    X_tr, y_tr, X_va, y_va, X_neg, n_classes, candidates, augment, seed = task
+    nn_dists = within_class_nn_distances(X_tr, y_tr, n_classes)
+    X_tr, y_tr = with_augmentation(X_tr, y_tr, augment, np.random.default_rng(seed))
+    k_max = max(c[0] for c in candidates)
+    model = KNNModel(X_tr, y_tr, range(n_classes), n_neighbors=k_max)
+    d_va, i_va = model.kneighbors(X_va)
+    d_ng, i_ng = model.kneighbors(X_neg) if len(X_neg) else (None, None)
+
+    scores = []
+    for k, weights, quantile, margin in candidates:
+        model.weights = weights
+        model.class_thresholds = class_thresholds_from(nn_dists, quantile, margin)
+        pred, _ = model.decide(d_va[:, :k], i_va[:, :k], SEARCH_MIN_CONFIDENCE)
+        accuracy = float(np.mean(pred == y_va))
+        false_accept = 0.0
+        if d_ng is not None:
+            neg, _ = model.decide(d_ng[:, :k], i_ng[:, :k], SEARCH_MIN_CONFIDENCE)
+            false_accept = float(np.mean(neg != -1))
+        scores.append((accuracy, false_accept))
+    return scores
+
+
+def stratified_folds(y, n_splits, rng):
+    """Yield (train_idx, val_idx) with every class spread across the folds."""
+    fold_of = np.empty(len(y), dtype=np.int64)
+    for c in np.unique(y):
+        members = rng.permutation(np.flatnonzero(y == c))
+        fold_of[members] = np.arange(len(members)) % n_splits
+    for f in range(n_splits):
+        yield np.flatnonzero(fold_of != f), np.flatnonzero(fold_of == f)
+
 # ---------------------------------------------------------------------------
 # Gesture Classifier (KNN)
 # ---------------------------------------------------------------------------
 class GestureClassifier:
     """K-Nearest Neighbours classifier on 63-D landmark vectors."""
 
-    def __init__(self):
+    NN_DISTANCE = METRICS.histogram(
+        "classifier_nn_distance", DISTANCE_BUCKETS,
+        "Distance from a live landmark vector to its nearest training sample",
+    )
+
+    def __init__(self, autoload=True):
         self.model = None
-        self.encoder = None
+        self.previous = None   # model replaced by the last promote(), for rollback()
+        self.candidate = None  # model from the last train(activate=False)
         self.accuracy = 0.0
-        self._load()
-
-    def _load(self):
-        if MODEL_PATH.exists():
+        self._save_lock = threading.Lock()  # one writer in MODEL_DIR at a time
+        self._saved = None  # model last written by persist()
+        self.cache = PredictionCache()
+        self.caches = [self.cache]  # one per camera session; all dropped on model swap
+        if autoload:
+            self.load()
+
+    def load(self):
+        if not MODEL_MANIFEST.exists() and LEGACY_MODEL_PATH.exists():
+            self._convert_legacy()
+        if MODEL_MANIFEST.exists():
             try:
-                with open(MODEL_PATH, "rb") as f:
-                    data = pickle.load(f)
-                self.model = data["model"]
-                self.encoder = data["encoder"]
-                self.accuracy = data.get("accuracy", 0.0)
-                log.info("Loaded trained model (accuracy %.1f%%)", self.accuracy * 100)
+                self.set_model(KNNModel.load(MODEL_DIR))
+                self._saved = self.model
+                log.info("Loaded trained model (accuracy %.1f%%, %d samples)",
+                         self.accuracy * 100, len(self.model))
             except Exception as e:
                 log.warning("Failed to load model: %s", e)
 
-    def predict(self, vector, threshold=0.55):
-        """Return (label, confidence) or (None, 0.0)."""
-        if self.model is None or self.encoder is None:
+    @staticmethod
+    def _convert_legacy():
+        try:
+            model = KNNModel.from_legacy_pickle(LEGACY_MODEL_PATH)
+            if META_PATH.exists():
+                with open(META_PATH, "r") as f:
+                    model.meta_hash = gesture_meta_hash(json.load(f))
+            model.save(MODEL_DIR)
+            LEGACY_MODEL_PATH.replace(LEGACY_MODEL_PATH.with_suffix(".pkl.bak"))
+            log.info("Converted legacy pickle model to %s", MODEL_DIR)
+        except Exception as e:
+            log.warning("Failed to convert legacy model: %s", e)
+
+    def set_model(self, model):
+        """Swap in a new model; a single attribute store, safe mid-prediction."""
+        self.model = model
+        self.accuracy = model.accuracy if model is not None else 0.0
+        for cache in self.caches:
+            cache.invalidate()
+
+    def promote(self, model):
+        """Make ``model`` active, keeping the current one for rollback()."""
+        self.previous = self.model
+        self.set_model(model)
+
+    def rollback(self):
+        """Swap the previous model back in — nothing is reloaded. Returns it, or None."""
+        if self.previous is None:
+            return None
+        self.previous, model = self.model, self.previous
+        self.set_model(model)
+        return model
+
+    def persist(self):
+        """Write the active model to MODEL_DIR (blocking; call on a worker).
+
+        Saves share the manifest temp file and delete each other's arrays, so
+        they are serialised; whichever model is active when a save gets the
+        lock is written, so a promote and a quick rollback end on disk as the
+        rolled-back model. Returns the model written, or None if up to date.
+        """
+        with self._save_lock:
+            model = self.model
+            if model is None or model is self._saved:
+                return None
+            model.save(MODEL_DIR)
+            self._saved = model
+            return model
+
+    def new_cache(self):
+        """A PredictionCache for another frame stream, invalidated with the others."""
+        cache = PredictionCache()
+        self.caches.append(cache)
+        return cache
+
+    def drop_cache(self, cache):
+        if cache is not self.cache and cache in self.caches:
+            self.caches.remove(cache)
+
+    def cache_stats(self):
+        hits = sum(c.hits for c in self.caches)
+        misses = sum(c.misses for c in self.caches)
+        total = hits + misses
+        return {"hits": hits, "misses": misses, "hitRate": round(hits / total, 3) if total else 0.0}
+
+    def predict(self, vector, threshold=0.55, cache=None, trace=None):
+        """Return (label, confidence) or (None, 0.0).
+
+        Near-identical consecutive vectors are answered from ``cache``
+        (default ``self.cache``); each frame stream should use its own.
+        A NeighborTrace passed as ``trace`` receives the neighbours consulted.
+        """
+        model = self.model
+        if trace is not None:
+            trace.n, trace.cached = 0, False
+        if model is None:
             return None, 0.0
+        cache = cache or self.cache
+        cached = cache.lookup(vector, threshold)
+        if cached is not None:
+            if trace is not None:
+                trace.cached = True
+            return cached
+        result = self._predict(model, vector, threshold, self.NN_DISTANCE, trace)
+        cache.store(vector, threshold, result)
+        return result
+
+    @staticmethod
+    def _predict(model, vector, threshold, distances=None, trace=None):
         try:
-            # 1. Distance Threshold (outlier detection)
-            # Find distance to nearest neighbor
-            dist, _ = self.model.kneighbors([vector], n_neighbors=1)
-            min_dist = dist[0][0]
-
-            # If the gesture is too far from any known sample, ignore it.
-            # 0.7 is a heuristic for 63-dim float32 vectors in [0,1] range.
-            # User can tune this via "confidence" slider if we map it,
-            # but for now we hardcode a reasonable safety net.
-            if min_dist > 0.65:
-                # log.debug(f"Ignored outlier: dist={min_dist:.3f}")
-                return None, 0.0
-
-            # 2. Probability Check
-            proba = self.model.predict_proba([vector])[0]
-            max_idx = np.argmax(proba)
-            confidence = float(proba[max_idx])
-            
-            if confidence >= threshold:
-                label = self.encoder.inverse_transform([max_idx])[0]
-                return label, confidence
+            # One neighbour search serves the vote and the outlier check: the
+            # input must lie within its predicted class's calibrated distance
+            # (or DEFAULT_REJECT_DIST of any sample for older models).
+            dist, idx = model.kneighbors(vector)
+            if distances is not None:
+                distances.observe(float(dist[0, 0]))
+            if trace is not None:
+                trace.fill(model, dist[0], idx[0])
+            best, confidence = model.decide(dist, idx, threshold)
+            if best[0] >= 0:
+                return model.classes[best[0]], float(confidence[0])
         except Exception as e:
             log.debug("Prediction error: %s", e)
         return None, 0.0
 
-    def train(self, gesture_map, progress_callback=None):
-        """Train on all .npy samples in data/gestures/{id}/. Returns accuracy."""
+    @staticmethod
+    def search_hyperparameters(X, y, n_classes, progress_callback=None, seed=42, augment=None):
+        """Cross-validated search over k, vote weighting and rejection distance.
+
+        Folds are scored in parallel worker processes on larger datasets.
+        Returns (best_candidate, summary_dict).
+        """
+        rng = np.random.default_rng(seed)
+        counts = np.bincount(y, minlength=n_classes)
+        n_splits = int(min(5, counts.min()))
+        if n_splits < 2:
+            return (min(5, len(X)), "distance", 0.99, 1.5), {"folds": 0}
+
+        tasks = []
+        for tr, va in stratified_folds(y, n_splits, rng):
+            candidates = search_candidates(max_k=len(tr))
+            X_neg = between_class_blends(X[va], y[va], len(va), rng)
+            tasks.append((X[tr], y[tr], X[va], y[va], X_neg, n_classes, candidates))
+        candidates = search_candidates(max_k=min(len(t[0]) for t in tasks))
+        tasks = [t[:6] + (candidates, augment, seed + i) for i, t in enumerate(tasks)]
+
+        workers = 1
+        factor = int((augment or {}).get("factor", 0))
+        if len(X) * (1 + max(factor, 0)) >= PARALLEL_SEARCH_MIN_SAMPLES:
+            workers = min(len(tasks), os.cpu_count() or 1)
+        if progress_callback:
+            progress_callback(
+                45, 0.0,
+                f"Searching {len(candidates)} settings × {len(tasks)} folds on {workers} worker(s)...",
+            )
+
+        t0 = time.perf_counter()
+        if workers > 1:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # spawn, not fork: the service is multi-threaded by the time it retrains
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as procs:
+                fold_scores = list(procs.map(cv_fold_scores, tasks))
+        else:
+            fold_scores = [cv_fold_scores(t) for t in tasks]
+
+        scores = np.array(fold_scores, dtype=np.float64).mean(axis=0)  # (n_candidates, 2)
+        objective = scores[:, 0] - SEARCH_FALSE_ACCEPT_WEIGHT * scores[:, 1]
+        tied = np.flatnonzero(objective >= objective.max() - SEARCH_TIE_EPSILON)
+        best = int(max(tied, key=lambda i: (candidates[i][0], candidates[i][2] * candidates[i][3])))
+        summary = {
+            "folds": len(tasks),
+            "candidates": len(candidates),
+            "workers": workers,
+            "seconds": round(time.perf_counter() - t0, 3),
+            "cvAccuracy": round(float(scores[best, 0]), 4),
+            "cvFalseAcceptRate": round(float(scores[best, 1]), 4),
+            "tied": int(len(tied)),
+            "tieBreak": {"rule": SEARCH_TIE_BREAK, "epsilon": SEARCH_TIE_EPSILON},
+        }
+        return candidates[best], summary
+
+    def train(self, gesture_map, progress_callback=None, augment=None, activate=True):
+        """Train on all .npy samples in data/gestures/{id}/. Returns accuracy.
+
+        ``augment`` ({"factor": n, "mirror": bool}) adds n synthetic variants
+        per training sample; the held-out evaluation split stays real-only.
+        With ``activate=False`` the model is neither saved nor used; it is
+        left in ``self.candidate`` for shadow evaluation.
+        """
+        if not activate:
+            self.candidate = None
         X, y = [], []
         gesture_names = {}
 
@@ -555,44 +1604,61 @@ class GestureClassifier:
         X = np.array(X, dtype=np.float32)
         y = np.array(y)
 
-        encoder = LabelEncoder()
-        y_enc = encoder.fit_transform(y)
+        classes, y_enc = np.unique(y, return_inverse=True)
+        y_enc = y_enc.astype(np.int32)
 
         if progress_callback:
             progress_callback(30, 0.0, "Encoding labels...")
 
         # Train/test split
         if len(X) >= 5 and len(set(y)) >= 2:
+            from sklearn.model_selection import train_test_split
             X_train, X_test, y_train, y_test = train_test_split(
                 X, y_enc, test_size=0.2, random_state=42, stratify=y_enc
             )
         else:
             X_train, X_test, y_train, y_test = X, X, y_enc, y_enc
 
-        k = min(5, len(X_train))
-        model = KNeighborsClassifier(n_neighbors=k, weights="distance")
+        (k, weights, quantile, margin), search = self.search_hyperparameters(
+            X_train, y_train, len(classes), progress_callback, augment=augment
+        )
+        search.update({
+            "n_neighbors": k, "weights": weights,
+            "reject_quantile": quantile, "reject_margin": margin,
+        })
+        log.info("Hyperparameter search: %s", search)
 
         if progress_callback:
-            progress_callback(50, 0.0, "Training KNN...")
-
-        model.fit(X_train, y_train)
+            progress_callback(60, 0.0, "Training KNN...")
+
+        nn_dists = within_class_nn_distances(X_train, y_train, len(classes))
+        n_real = len(X_train)
+        X_train, y_train = with_augmentation(X_train, y_train, augment, np.random.default_rng(42))
+        if len(X_train) > n_real:
+            search["augmentedSamples"] = int(len(X_train) - n_real)
+        model = KNNModel(
+            np.ascontiguousarray(X_train), y_train, [str(c) for c in classes],
+            n_neighbors=min(k, len(X_train)), weights=weights,
+            meta_hash=gesture_meta_hash(gesture_map),
+            class_thresholds=class_thresholds_from(nn_dists, quantile, margin),
+            search=search,
+        )
 
         if progress_callback:
             progress_callback(70, 0.0, "Evaluating...")
 
-        accuracy = float(model.score(X_test, y_test))
-
-        # Save
-        with open(MODEL_PATH, "wb") as f:
-            pickle.dump({"model": model, "encoder": encoder, "accuracy": accuracy}, f)
+        accuracy = float(np.mean(model.predict(X_test) == y_test))
+        model.accuracy = accuracy
 
-        meta = {gid: info for gid, info in gesture_map.items()}
-        with open(META_PATH, "w") as f:
-            json.dump(meta, f, indent=2)
+        if activate:
+            self.promote(model)
+            self.persist()
 
-        self.model = model
-        self.encoder = encoder
-        self.accuracy = accuracy
+            meta = {gid: info for gid, info in gesture_map.items()}
+            with open(META_PATH, "w") as f:
+                json.dump(meta, f, indent=2)
+        else:
+            self.candidate = model
 
         if progress_callback:
             progress_callback(100, accuracy, "Complete")
@@ -600,55 +1666,382 @@ class GestureClassifier:
         log.info("Training complete — accuracy %.1f%% on %d samples", accuracy * 100, len(X))
         return accuracy
 
+# ---------------------------------------------------------------------------
+# Shadow Evaluation (candidate model on live vectors, off the frame path)
+# ---------------------------------------------------------------------------
+SHADOW_BATCH = 32
+SHADOW_LATENCY_BUCKETS_MS = (0.05, 0.1, 0.2, 0.35, 0.5, 0.75, 1, 2, 5, 10, 25)
+SHADOW_REPORT_EVERY = 2.0  # seconds between shadow_report broadcasts
+
+
+class ShadowEvaluation:
+    """Compares a candidate model with the active one on live landmark vectors.
+
+    The camera loop only ``offer()``s vectors. ``evaluate()`` runs on a
+    worker thread and replays each queued vector through both models one at
+    a time, as live prediction does, so their per-prediction latencies are
+    comparable. Stability is the rate at which the label changes from one
+    vector to the next. Vectors beyond the queue bound are dropped.
+    """
+
+    def __init__(self, candidate, source):
+        self.candidate = candidate
+        self.source = source  # "retrain" or the model directory it came from
+        self.pending = deque(maxlen=SHADOW_BATCH * 4)
+        self.dropped = 0
+        self.compared = 0
+        self.agreed = 0
+        self.disagreements = {}  # (active label, candidate label) -> count
+        self.latency = {
+            "active": Histogram(SHADOW_LATENCY_BUCKETS_MS),
+            "candidate": Histogram(SHADOW_LATENCY_BUCKETS_MS),
+        }
+        self.rejected = {"active": 0, "candidate": 0}
+        self.flips = {"active": 0, "candidate": 0}
+        self._last = {}
+        self.busy = False
+        self.started_at = time.time()
+        self.reported_at = 0.0
+
+    def offer(self, vector, threshold):
+        if len(self.pending) == self.pending.maxlen:
+            self.dropped += 1
+        self.pending.append((vector, threshold))
+
+    @property
+    def due(self):
+        return not self.busy and len(self.pending) >= SHADOW_BATCH
+
+    def evaluate(self, active):
+        """Drain the queue through ``active`` and the candidate (worker thread)."""
+        models = (("active", active), ("candidate", self.candidate))
+        for _ in range(len(self.pending)):
+            vector, threshold = self.pending.popleft()
+            labels = []
+            for name, model in models:
+                label = None
+                if model is not None:
+                    t0 = time.perf_counter()
+                    label, _ = GestureClassifier._predict(model, vector, threshold)
+                    self.latency[name].observe((time.perf_counter() - t0) * 1000)
+                if label is None:
+                    self.rejected[name] += 1
+                if name in self._last and label != self._last[name]:
+                    self.flips[name] += 1
+                self._last[name] = label
+                labels.append(label)
+            self.compared += 1
+            if labels[0] == labels[1]:
+                self.agreed += 1
+            else:
+                key = tuple(labels)
+                self.disagreements[key] = self.disagreements.get(key, 0) + 1
+
+    def report(self, top=5):
+        n = self.compared
+
+        def rate(count):
+            return round(count / n, 4) if n else None
+
+        def latency(h):
+            p95 = h.quantile(0.95)
+            return {
+                "mean": round(h.sum / h.count, 3) if h.count else None,
+                "p50": h.quantile(0.5),
+                "p95": None if p95 == float("inf") else p95,
+            }
+
+        pairs = sorted(self.disagreements.items(), key=lambda kv: kv[1], reverse=True)[:top]
+        return {
+            "source": self.source,
+            "candidate": {
+                "accuracy": round(self.candidate.accuracy * 100, 1),
+                "samples": len(self.candidate),
+                "classes": self.candidate.classes,
+            },
+            "seconds": round(time.time() - self.started_at, 1),
+            "compared": n,
+            "dropped": self.dropped,
+            "agreement": rate(self.agreed),
+            "rejectRate": {name: rate(k) for name, k in self.rejected.items()},
+            "flipRate": {name: rate(k) for name, k in self.flips.items()},
+            "latencyMs": {name: latency(h) for name, h in self.latency.items()},
+            "disagreements": [
+                {"active": a, "candidate": c, "count": k} for (a, c), k in pairs
+            ],
+        }
+
 # ---------------------------------------------------------------------------
 # Sample Recorder
 # ---------------------------------------------------------------------------
 class SampleRecorder:
-    """Records .npy landmark samples for a specific gesture."""
+    """Records .npy landmark samples for a specific gesture.
 
-    def __init__(self):
+    Frames within ``min_distance`` (L2, normalised space) of a recently kept
+    sample — including samples already on disk — are skipped, so holding a
+    pose doesn't fill the dataset with near-duplicates. Recording ends at
+    ``total`` kept samples, or earlier once coverage saturates: after
+    ``min_samples`` keeps, nearly every new frame is a duplicate.
+    """
+
+    def __init__(self, min_distance=0.1, window=256, min_samples=20,
+                 saturation_window=75, saturation_coverage=0.97):
         self.active = False
         self.gesture_id = None
         self.recorded = 0
         self.total = 80
-
-    def start(self, gesture_id, total=80):
+        self.rejected = 0
+        self.saturated = False
+        self.default_min_distance = min_distance
+        self.min_distance = min_distance
+        self.min_samples = min_samples
+        self.saturation_coverage = saturation_coverage
+        self._window = np.zeros((window, 63), dtype=np.float32)
+        self._filled = 0
+        self._next = 0
+        self._recent = deque(maxlen=saturation_window)  # 1 = frame rejected as duplicate
+        self._novelty_sum = 0.0
+
+    def start(self, gesture_id, total=80, min_distance=None):
         self.gesture_id = gesture_id
         self.total = total
         self.recorded = 0
+        self.rejected = 0
+        self.saturated = False
+        # Per recording: the recorder is reused, so an override must not stick
+        self.min_distance = self.default_min_distance if min_distance is None else float(min_distance)
+        self._filled = 0
+        self._next = 0
+        self._recent.clear()
+        self._novelty_sum = 0.0
         self.active = True
         sample_dir = GESTURES_DIR / gesture_id
         sample_dir.mkdir(parents=True, exist_ok=True)
-        log.info("Recording started for gesture '%s' (%d samples)", gesture_id, total)
+        self._seed_from_disk(sample_dir)
+        log.info("Recording started for gesture '%s' (up to %d samples, min distance %.3f)",
+                 gesture_id, total, self.min_distance)
+
+    def _seed_from_disk(self, sample_dir):
+        """Prime the duplicate window with the newest existing samples."""
+        files = sorted(sample_dir.glob("*.npy"), key=lambda f: f.stat().st_mtime)
+        for f in files[-len(self._window):]:
+            try:
+                vec = np.load(str(f))
+            except Exception:
+                continue
+            if vec.shape == (63,):
+                self._remember(vec)
+
+    def _remember(self, vector):
+        self._window[self._next] = vector
+        self._next = (self._next + 1) % len(self._window)
+        self._filled = min(self._filled + 1, len(self._window))
+
+    def _nearest_kept(self, vector):
+        if not self._filled:
+            return np.inf
+        diff = self._window[:self._filled] - vector
+        return float(np.sqrt(np.einsum("ij,ij->i", diff, diff).min()))
 
     def stop(self):
         self.active = False
-        log.info("Recording stopped (%d samples saved)", self.recorded)
+        log.info("Recording stopped (%d samples saved, %d near-duplicates skipped)",
+                 self.recorded, self.rejected)
+
+    @property
+    def coverage(self):
+        """Share of recent frames already covered by kept samples (0 → 1 = saturated)."""
+        return sum(self._recent) / len(self._recent) if self._recent else 0.0
+
+    @property
+    def diversity(self):
+        """Mean distance of each kept sample to its nearest previously kept one."""
+        return self._novelty_sum / self.recorded if self.recorded else 0.0
+
+    def progress(self):
+        return {
+            "rejected": self.rejected,
+            "coverage": round(self.coverage, 3),
+            "diversity": round(self.diversity, 4),
+            "saturated": self.saturated,
+        }
 
     def save_sample(self, vector):
-        """Save one sample. Returns True if still recording."""
+        """Offer one frame; it's saved only if it adds coverage. Returns True if still recording."""
         if not self.active or self.gesture_id is None:
             return False
-        sample_dir = GESTURES_DIR / self.gesture_id
-        filename = sample_dir / f"sample_{int(time.time()*1000)}_{self.recorded}.npy"
-        np.save(str(filename), vector)
-        self.recorded += 1
+        nearest = self._nearest_kept(vector)
+        if nearest < self.min_distance:
+            self.rejected += 1
+            self._recent.append(1)
+        else:
+            self._recent.append(0)
+            sample_dir = GESTURES_DIR / self.gesture_id
+            filename = sample_dir / f"sample_{int(time.time()*1000)}_{self.recorded}.npy"
+            np.save(str(filename), vector)
+            self._remember(vector)
+            if np.isfinite(nearest):
+                self._novelty_sum += min(nearest, 1.0)
+            self.recorded += 1
+
         if self.recorded >= self.total:
             self.active = False
             log.info("Recording complete for '%s' (%d samples)", self.gesture_id, self.recorded)
+        elif (self.recorded >= self.min_samples
+              and len(self._recent) == self._recent.maxlen
+              and self.coverage >= self.saturation_coverage):
+            self.active = False
+            self.saturated = True
+            log.info("Recording saturated for '%s' (%d samples, %d duplicates skipped)",
+                     self.gesture_id, self.recorded, self.rejected)
         return self.active
 
+# ---------------------------------------------------------------------------
+# Bulk Sample Import (video files / image folders → landmark vectors)
+# ---------------------------------------------------------------------------
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+VIDEO_EXTENSIONS = {".mp4", ".avi", ".mov", ".mkv", ".webm", ".m4v"}
+IMPORT_IMAGE_BATCH = 32
+
+_import_detectors = {}  # per worker process: static_image_mode -> HandDetector
+
+
+def _import_detector(static_image_mode):
+    detector = _import_detectors.get(static_image_mode)
+    if detector is None:
+        detector = _import_detectors[static_image_mode] = HandDetector(static_image_mode)
+    return detector
+
+
+def plan_import_tasks(paths):
+    """Expand files/folders into worker tasks: one per video, images in batches."""
+    videos, images = [], []
+    for raw in paths:
+        path = Path(raw).expanduser()
+        files = sorted(path.rglob("*")) if path.is_dir() else [path]
+        for f in files:
+            ext = f.suffix.lower()
+            if ext in VIDEO_EXTENSIONS:
+                videos.append(str(f))
+            elif ext in IMAGE_EXTENSIONS:
+                images.append(str(f))
+    tasks = [("video", [v]) for v in videos]
+    for i in range(0, len(images), IMPORT_IMAGE_BATCH):
+        tasks.append(("images", images[i:i + IMPORT_IMAGE_BATCH]))
+    return tasks
+
+
+def extract_import_task(task, stride=1, flip=True):
+    """Worker entry point: run landmark extraction over one task.
+
+    Frames are mirrored like the live camera feed (``flip``) so imported
+    samples match what the classifier sees at runtime. Returns
+    (vectors (n, 63) float32, frames_examined).
+    """
+    import cv2
+    kind, files = task
+    vectors, examined = [], 0
+    if kind == "video":
+        detector = _import_detector(static_image_mode=False)
+        capture = cv2.VideoCapture(files[0])
+        index = 0
+        while True:
+            ok = capture.grab()
+            if not ok:
+                break
+            index += 1
+            if (index - 1) % stride:
+                continue
+            ok, frame = capture.retrieve()
+            if not ok:
+                continue
+            examined += 1
+            if flip:
+                frame = cv2.flip(frame, 1)
+            vec = detector.extract(frame)
+            if vec is not None:
+                vectors.append(vec)
+        capture.release()
+    else:
+        detector = _import_detector(static_image_mode=True)
+        for f in files:
+            frame = cv2.imread(f)
+            if frame is None:
+                continue
+            examined += 1
+            if flip:
+                frame = cv2.flip(frame, 1)
+            vec = detector.extract(frame)
+            if vec is not None:
+                vectors.append(vec)
+    out = np.array(vectors, dtype=np.float32).reshape(-1, 63)
+    return out, examined
+
+
+def import_samples(gesture_id, paths, stride=1, flip=True, min_distance=None,
+                   workers=None, progress_callback=None):
+    """Extract landmarks from ``paths`` across a process pool into a gesture's sample dir.
+
+    Vectors go through a SampleRecorder so the same near-duplicate filter as
+    live recording applies. ``progress_callback(done, total, kept, examined)``
+    is called as each task finishes. Returns a summary dict.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    tasks = plan_import_tasks(paths)
+    recorder = SampleRecorder(saturation_coverage=float("inf"))
+    recorder.start(gesture_id, total=sys.maxsize, min_distance=min_distance)
+    t0 = time.perf_counter()
+    examined = 0
+    workers = max(1, min(workers or os.cpu_count() or 1, len(tasks) or 1))
+    if tasks:
+        # spawn, not fork: MediaPipe graphs don't survive being forked mid-run
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as procs:
+            futures = [procs.submit(extract_import_task, t, stride, flip) for t in tasks]
+            for done, future in enumerate(as_completed(futures), 1):
+                try:
+                    vectors, n = future.result()
+                except Exception as e:
+                    log.warning("Import task failed: %s", e)
+                    vectors, n = (), 0
+                examined += n
+                for vec in vectors:
+                    recorder.save_sample(vec)
+                if progress_callback:
+                    progress_callback(done, len(tasks), recorder.recorded, examined)
+    recorder.stop()
+    elapsed = time.perf_counter() - t0
+    summary = {
+        "id": gesture_id,
+        "tasks": len(tasks),
+        "workers": workers,
+        "framesExamined": examined,
+        "samplesAdded": recorder.recorded,
+        "duplicatesSkipped": recorder.rejected,
+        "seconds": round(elapsed, 2),
+        "framesPerSec": round(examined / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+    log.info("Import complete: %s", summary)
+    return summary
+
 # ---------------------------------------------------------------------------
 # Action Executor (debounce + cooldown)
 # ---------------------------------------------------------------------------
 class ActionExecutor:
-    """Fires desktop actions with debounce buffer and cooldown."""
+    """Fires desktop actions with debounce buffer and cooldown.
+
+    With ``dispatch=False`` the debounce and cooldown still apply but the
+    action is only reported, for sessions whose desktop isn't this machine.
+    """
 
-    def __init__(self, buffer_size=6, cooldown=1.2):
+    def __init__(self, buffer_size=6, cooldown=1.2, dispatch=True):
         self.buffer = deque(maxlen=buffer_size)
         self.cooldowns = {}
         self.cooldown_duration = cooldown
         self.enabled = True
+        self.dispatch = dispatch
 
     def feed(self, gesture_name, action_name, gesture_map):
         """Feed a detection. Returns the action name if fired, else None."""
@@ -673,6 +2066,10 @@ class ActionExecutor:
         if now - last_fired < self.cooldown_duration:
             return None
 
+        if not self.dispatch:
+            self.cooldowns[action_name] = now
+            return action_name
+
         # Fire action
         action_fn = ACTION_MAP.get(action_name)
         if action_fn:
@@ -685,44 +2082,564 @@ class ActionExecutor:
                 log.error("Action error: %s", e)
         return None
 
+    def cooldown_left(self, action_name):
+        """Seconds until ``action_name`` may fire again (0 when ready)."""
+        last_fired = self.cooldowns.get(action_name)
+        if last_fired is None:
+            return 0.0
+        return max(0.0, self.cooldown_duration - (time.time() - last_fired))
+
+# ---------------------------------------------------------------------------
+# Flight Recorder (always-on ring buffer of per-frame gesture decisions)
+# ---------------------------------------------------------------------------
+FLIGHT_CAPACITY = 4096   # frames (~2.5 min of one camera at 25 fps, ~1.3 MB)
+FLIGHT_NEIGHBORS = 8     # neighbour distances / labels kept per frame
+FLIGHT_BUFFER = 16       # ActionExecutor buffer entries kept per frame
+FLIGHT_MODES = ("none", "predict", "cursor", "recording")  # "none": no hand
+
+
+class NeighborTrace:
+    """The neighbours behind one prediction, overwritten in place every frame."""
+
+    __slots__ = ("dist", "labels", "n", "cached")
+
+    def __init__(self, k=FLIGHT_NEIGHBORS):
+        self.dist = np.zeros(k, dtype=np.float32)
+        self.labels = [None] * k
+        self.n = 0
+        self.cached = False  # answered from the PredictionCache, no search ran
+
+    def fill(self, model, dist, idx):
+        n = min(len(dist), len(self.labels))
+        self.dist[:n] = dist[:n]
+        y, classes = model.y, model.classes
+        for j in range(n):
+            self.labels[j] = classes[y[idx[j]]]
+        self.n = n
+
+
+class FlightRecorder:
+    """Fixed-size ring buffer of per-frame decision data, on permanently.
+
+    Every column is a numpy array allocated once; ``record()`` writes one row
+    in place, so memory is bounded and the frame path allocates nothing here.
+    Gesture, action and session names are interned as int16 ids (-1 = none)
+    into ``names``, which only grows with the gesture set. ``dump()`` writes
+    the newest rows in time order to a compressed ``.npz`` that
+    ``replay_flight()`` re-runs through a classifier offline.
+    """
+
+    def __init__(self, capacity=FLIGHT_CAPACITY, neighbors=FLIGHT_NEIGHBORS, buffer=FLIGHT_BUFFER):
+        self.capacity = capacity
+        self.time = np.zeros(capacity, dtype=np.float64)        # epoch seconds at capture
+        self.session = np.full(capacity, -1, dtype=np.int16)
+        self.mode = np.zeros(capacity, dtype=np.uint8)          # index into FLIGHT_MODES
+        self.vector = np.zeros((capacity, 63), dtype=np.float32)
+        self.cached = np.zeros(capacity, dtype=bool)
+        self.nn_dist = np.full((capacity, neighbors), np.nan, dtype=np.float32)
+        self.nn_label = np.full((capacity, neighbors), -1, dtype=np.int16)
+        self.label = np.full(capacity, -1, dtype=np.int16)
+        self.confidence = np.zeros(capacity, dtype=np.float32)
+        self.threshold = np.zeros(capacity, dtype=np.float32)
+        self.buffer = np.full((capacity, buffer), -1, dtype=np.int16)  # debounce buffer, oldest first
+        self.action = np.full(capacity, -1, dtype=np.int16)     # action routed for the label
+        self.cooldown_ms = np.zeros(capacity, dtype=np.float32) # cooldown left before this frame
+        self.fired = np.zeros(capacity, dtype=bool)
+        self.latency_ms = np.zeros(capacity, dtype=np.float32)
+        self.names = []
+        self._ids = {}
+        self.head = 0   # next row to write
+        self.count = 0
+
+    COLUMNS = ("time", "session", "mode", "vector", "cached", "nn_dist", "nn_label", "label",
+               "confidence", "threshold", "buffer", "action", "cooldown_ms", "fired", "latency_ms")
+
+    def intern(self, name):
+        if name is None:
+            return -1
+        i = self._ids.get(name)
+        if i is None:
+            i = self._ids[name] = len(self.names)
+            self.names.append(name)
+        return i
+
+    def record(self, when, session, mode, vector, trace, label, confidence, threshold,
+               executor, action, cooldown_left, fired, latency_ms):
+        i = self.head
+        self.time[i] = when
+        self.session[i] = self.intern(session)
+        self.mode[i] = mode
+        if vector is not None:
+            self.vector[i] = vector
+        else:
+            self.vector[i] = 0.0
+        n = trace.n if trace is not None else 0
+        self.cached[i] = trace is not None and trace.cached
+        self.nn_dist[i, :n] = trace.dist[:n] if n else 0.0
+        self.nn_dist[i, n:] = np.nan
+        nn_label = self.nn_label[i]
+        for j in range(n):
+            nn_label[j] = self.intern(trace.labels[j])
+        nn_label[n:] = -1
+        self.label[i] = self.intern(label)
+        self.confidence[i] = confidence
+        self.threshold[i] = threshold
+        row = self.buffer[i]
+        j = 0
+        if executor is not None:
+            # Newest entries win if the executor's buffer is longer than ours
+            skip = max(0, len(executor.buffer) - len(row))
+            for name in executor.buffer:
+                if skip:
+                    skip -= 1
+                    continue
+                row[j] = self.intern(name)
+                j += 1
+        row[j:] = -1
+        self.action[i] = self.intern(action)
+        self.cooldown_ms[i] = cooldown_left * 1000
+        self.fired[i] = fired
+        self.latency_ms[i] = latency_ms
+        self.head = (i + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def snapshot(self, seconds=None):
+        """Copy of the newest rows in time order (the last ``seconds`` if given)."""
+        rows = (np.arange(self.count) + self.head - self.count) % self.capacity
+        if seconds is not None and len(rows):
+            rows = rows[self.time[rows] >= self.time[rows[-1]] - seconds]
+        data = {name: getattr(self, name)[rows] for name in self.COLUMNS}
+        data["names"] = np.array(json.dumps(self.names))
+        data["modes"] = np.array(json.dumps(FLIGHT_MODES))
+        return data
+
+    @staticmethod
+    def dump(data, directory=FLIGHT_DIR):
+        """Write a snapshot as compressed .npz. Returns the path."""
+        directory.mkdir(parents=True, exist_ok=True)
+        now = time.time()
+        stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(now))
+        name = f"flight_{stamp}_{int(now * 1000) % 1000:03d}"
+        path = directory / f"{name}.npz"
+        n = 1
+        while path.exists():  # same millisecond
+            path = directory / f"{name}_{n}.npz"
+            n += 1
+        np.savez_compressed(str(path), **data)
+        return path
+
+
+def replay_flight(path, model=None):
+    """Re-run a flight-recorder dump through ``model`` (default: the saved model).
+
+    Returns a summary plus every hand frame where the replayed decision
+    differs from the recorded one — e.g. to check whether a retrained model
+    would have avoided a misfire. Debounce and cooldowns are not replayed;
+    the recorded buffer and cooldown columns show why an action did or
+    didn't fire.
+    """
+    with np.load(str(path), allow_pickle=False) as dump:
+        data = {key: dump[key] for key in dump.files}
+    names = json.loads(str(data["names"]))
+    modes = json.loads(str(data["modes"]))
+    model = model if model is not None else KNNModel.load(MODEL_DIR)
+
+    def name(i):
+        return names[i] if i >= 0 else None
+
+    t = data["time"]
+    start = float(t[0]) if len(t) else 0.0
+    rows = np.flatnonzero(np.isin(data["mode"], [modes.index("predict"), modes.index("cursor")]))
+    diffs = []
+    if len(rows):
+        dist, idx = model.kneighbors(data["vector"][rows])
+        best, confidence = model.decide(dist, idx)
+        accepted = (best >= 0) & (confidence >= data["threshold"][rows])
+        for r, b, ok, conf, nearest in zip(rows, best, accepted, confidence, dist[:, 0]):
+            recorded, replayed = name(data["label"][r]), (model.classes[b] if ok else None)
+            if recorded != replayed:
+                diffs.append({
+                    "t": round(float(t[r]) - start, 3),
+                    "recorded": recorded,
+                    "recordedConfidence": round(float(data["confidence"][r]), 3),
+                    "replayed": replayed,
+                    "replayedConfidence": round(float(conf), 3),
+                    "recordedNearest": None if data["cached"][r] else round(float(data["nn_dist"][r, 0]), 4),
+                    "replayedNearest": round(float(nearest), 4),
+                })
+    fired = [
+        {"t": round(float(t[r]) - start, 3), "action": name(data["action"][r]),
+         "gesture": name(data["label"][r]), "session": name(data["session"][r])}
+        for r in np.flatnonzero(data["fired"])
+    ]
+    return {
+        "frames": int(len(t)),
+        "seconds": round(float(t[-1]) - start, 2) if len(t) else 0.0,
+        "classifiedFrames": int(len(rows)),
+        "changed": len(diffs),
+        "agreement": round(1 - len(diffs) / len(rows), 4) if len(rows) else None,
+        "fired": fired,
+        "diffs": diffs,
+    }
+
+# ---------------------------------------------------------------------------
+# Client Subscriptions (topics + compact landmark stream)
+# ---------------------------------------------------------------------------
+TOPICS = ("preview", "detections", "landmarks", "training", "stats")
+# Connections that never subscribe get the original stream: full-rate,
+# full-size preview frames with detections embedded, no landmark packets
+DEFAULT_SUBSCRIPTION = {
+    "topics": frozenset(TOPICS) - {"landmarks"},
+    "previewFps": None,
+    "previewWidth": None,
+}
+
+LANDMARK_MAGIC = b"LM"
+LANDMARK_VERSION = 1
+LANDMARK_SCALE = 16384  # int16 units per image width: ±2.0 range, ~6e-5 resolution
+LANDMARK_HEADER = struct.Struct("<2sBBdB")  # magic, version, flags, captured (epoch s), session length
+
+
+def pack_landmarks(session, captured_at, raw_landmarks):
+    """Binary landmark packet for the ``landmarks`` topic.
+
+    Layout (little-endian): the 13-byte ``LANDMARK_HEADER``, the UTF-8
+    session name, then 21 × (x, y, z) int16 in units of 1/LANDMARK_SCALE.
+    Flag bit 0 marks a hand; without one the packet ends after the name.
+    About 150 bytes per frame, against ~1.5 kB for the same data as JSON.
+    """
+    name = session.encode("utf-8")[:255]
+    hand = raw_landmarks is not None
+    header = LANDMARK_HEADER.pack(LANDMARK_MAGIC, LANDMARK_VERSION, int(hand), captured_at, len(name))
+    if not hand:
+        return header + name
+    q = np.rint(np.asarray(raw_landmarks, dtype=np.float32) * LANDMARK_SCALE)
+    return header + name + np.clip(q, -32768, 32767).astype("<i2").tobytes()
+
+
+def unpack_landmarks(packet):
+    """Inverse of pack_landmarks → (session, captured_at, 21×3 float32 | None)."""
+    magic, version, flags, captured_at, n = LANDMARK_HEADER.unpack_from(packet)
+    if magic != LANDMARK_MAGIC or version != LANDMARK_VERSION:
+        raise ValueError("Not a landmark packet")
+    offset = LANDMARK_HEADER.size
+    session = bytes(packet[offset:offset + n]).decode("utf-8")
+    if not flags & 1:
+        return session, captured_at, None
+    q = np.frombuffer(packet, dtype="<i2", count=63, offset=offset + n)
+    return session, captured_at, (q.astype(np.float32) / LANDMARK_SCALE).reshape(21, 3)
+
+# ---------------------------------------------------------------------------
+# Camera Sessions (named local capture pipelines sharing one model)
+# ---------------------------------------------------------------------------
+DEFAULT_CAMERA = "default"
+
+
+def parse_camera_config(data):
+    """The CAMERA_CONFIG keys present in ``data``, coerced and range-checked.
+
+    Raises ValueError naming the first bad setting.
+    """
+    config = {}
+    for key in CAMERA_CONFIG:
+        if key not in data:
+            continue
+        value = data[key]
+        if key == "fourcc":
+            value = "" if value is None else str(value)
+            if value and len(value) != 4:
+                raise ValueError(f"fourcc must be 4 characters (or empty), got {value!r}")
+        else:
+            lo, hi = CAMERA_LIMITS[key]
+            try:
+                value = float(value) if key == "fps" else int(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"{key} must be a number, got {value!r}") from None
+            if not lo <= value <= hi:
+                raise ValueError(f"{key} must be between {lo} and {hi}, got {value}")
+        config[key] = value
+    return config
+
+
+class CameraSession:
+    """One local camera: device, grabber thread, detector, recorder and debounce.
+
+    Sessions share the service's classifier, gesture routing table and frame
+    pool, so an extra camera costs a MediaPipe graph and a few frame buffers,
+    not another copy of the model. Each session runs its blocking frame work
+    on its own single worker thread, which also keeps its detector
+    single-threaded.
+    """
+
+    def __init__(self, name, cache, buffer_size=6, cooldown=1.2):
+        self.name = name
+        self.config = dict(CAMERA_CONFIG)
+        self.camera = None
+        self.grabber = None
+        self.detector = None
+        self.recorder = SampleRecorder()
+        self.executor = ActionExecutor(buffer_size, cooldown)
+        self.cache = cache
+        self.trace = NeighborTrace()  # reused every frame for the flight recorder
+        self.worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"camera-{name}")
+        self.frame_latency = deque(maxlen=100)  # capture → broadcast, ms
+        self.fps = 0.0
+        self.last_preview = 0.0
+        self.on = False
+        self.task = None
+        self.started_at = None
+        self.state = "stopped"  # "running" | "recovering" | "stopped"
+        self.restarts = 0
+        self.backoff = 0.0      # delay before the next reopen; reset by a good frame
+        self.last_recovery_ms = None
+
+    def close(self):
+        """Release everything but the (reusable) detector."""
+        if self.grabber:
+            self.grabber.stop()
+            self.grabber = None
+        if self.camera:
+            self.camera.release()
+            self.camera = None
+        self.state = "stopped"
+
+    def shutdown(self):
+        self.close()
+        self.worker.shutdown(wait=True)
+        if self.detector is not None:
+            self.detector.close()
+            self.detector = None
+
+# ---------------------------------------------------------------------------
+# Remote Sessions (clients stream frames or landmarks; server classifies)
+# ---------------------------------------------------------------------------
+REMOTE_TICK = 1.0 / 25      # batch classification cadence (s)
+REMOTE_IDLE_TIMEOUT = 30.0  # sessions silent this long are dropped (s)
+
+
+class RemoteSession:
+    """Per-connection state for a remotely fed camera.
+
+    Each session owns its MediaPipe graph (created on the first frame; not
+    needed when the client sends landmarks), debounce/cooldown state and the
+    newest unclassified vector. Actions are reported, never executed here.
+    """
+
+    def __init__(self, ws, session_id, flip=True, buffer_size=6, cooldown=1.2):
+        self.ws = ws
+        self.session_id = session_id
+        self.flip = flip
+        self.detector = None
+        self.executor = ActionExecutor(buffer_size, cooldown, dispatch=False)
+        self.pending = None       # newest normalised vector awaiting the next tick
+        self.pending_at = 0.0     # perf_counter when it arrived
+        self.busy = False         # a frame is being decoded/detected
+        self.frames = 0
+        self.dropped = 0          # frames skipped because the previous one was still in flight
+        self.last_seen = time.monotonic()
+        self.closed = False
+
+    def detect(self, payload):
+        """Blocking: decode a base64 JPEG/PNG (optionally a data: URL) and extract landmarks."""
+        import cv2
+        if payload.startswith("data:"):
+            payload = payload.split(",", 1)[1]
+        buf = np.frombuffer(base64.b64decode(payload), dtype=np.uint8)
+        frame = cv2.imdecode(buf, cv2.IMREAD_COLOR)
+        if frame is None:
+            return None
+        if self.flip:
+            frame = cv2.flip(frame, 1)
+        if self.detector is None:
+            self.detector = HandDetector()
+        return self.detector.extract(frame)
+
+    def close(self):
+        """Release the detector — deferred until an in-flight frame finishes."""
+        self.closed = True
+        if not self.busy and self.detector is not None:
+            self.detector.close()
+            self.detector = None
+
 # ---------------------------------------------------------------------------
 # WebSocket Service
 # ---------------------------------------------------------------------------
 class GestureService:
     """Main service orchestrating camera, ML, and WebSocket communication."""
 
+    # Commands that only touch cheap state and are served while warming up
+    COLD_COMMANDS = {
+        "get_stats", "get_metrics", "get_gestures", "update_settings",
+        "start_profile", "stop_profile", "shadow_status", "stop_shadow",
+        "add_gesture", "update_gesture", "delete_gesture", "toggle_gesture", "sync_gestures",
+        "toggle_cursor_mode", "camera_stop", "stop_recording", "list_cameras", "subscribe",
+        "import_samples", "dump_flight",
+    }
+
+    # Polled or streamed commands, logged at debug level only
+    QUIET_COMMANDS = {"get_metrics", "get_stats", "remote_frame", "remote_landmarks"}
+
+    RSS_SAMPLE_EVERY = 250  # frames (~10 s at 25 fps)
+
+    # Per-frame instruments; stage timings are milliseconds
+    M_FRAMES = METRICS.counter("frames_total", "Frames processed by the camera loop")
+    M_HANDS = METRICS.counter("hand_frames_total", "Frames with a detected hand")
+    M_PREDICTIONS = METRICS.counter("predictions_total", "Gesture predictions made")
+    M_REJECTED = METRICS.counter("predictions_rejected_total", "Predictions below threshold or out of distribution")
+    M_FIRED = METRICS.counter("actions_fired_total", "Desktop actions executed")
+    M_FPS = METRICS.gauge("camera_fps", "Camera loop throughput, all cameras (smoothed)")
+    M_CAPTURE_WAIT = METRICS.histogram("stage_capture_wait_ms", help="Waiting for the grabber's next frame")
+    M_PREPROCESS = METRICS.histogram("stage_preprocess_ms", help="Flip and resize")
+    M_DETECT = METRICS.histogram("stage_detect_ms", help="MediaPipe hand landmarks + overlay")
+    M_ENCODE = METRICS.histogram("stage_encode_ms", help="JPEG + base64 encoding")
+    M_CLASSIFY = METRICS.histogram("stage_classify_ms", help="Gesture classification")
+    M_BROADCAST = METRICS.histogram("stage_broadcast_ms", help="Sending the frame to clients")
+    M_LATENCY = METRICS.histogram("frame_latency_ms", help="Capture to broadcast")
+    M_ACTION_LATENCY = METRICS.histogram("action_fire_latency_ms", help="Capture to action executed")
+    M_CAMERA_RESTARTS = METRICS.counter("camera_restarts_total", "Stalled or failing cameras reopened by the watchdog")
+    M_CAMERA_RECOVERY = METRICS.histogram(
+        "camera_recovery_ms", (50, 100, 250, 500, 1000, 2500, 5000, 10000),
+        "Stall detected (or settings changed) to capture running again")
+    M_REMOTE_BATCH = METRICS.histogram(
+        "remote_batch_size", (1, 2, 4, 8, 16, 32, 64, 128, 256), "Sessions classified per tick")
+    M_REMOTE_TICK = METRICS.histogram("remote_tick_ms", help="Batched classification of one tick")
+    M_REMOTE_DETECT = METRICS.histogram("remote_detect_ms", help="Decode + landmark extraction of a remote frame")
+
     def __init__(self):
-        self.detector = HandDetector()
-        self.classifier = GestureClassifier()
-        self.recorder = SampleRecorder()
-        self.executor = ActionExecutor()
-        self.cursor_controller = CursorController()  # NEW
-        self.pool = ThreadPoolExecutor(max_workers=2)
+        # Detector, model and cursor controller are created by warm_up()
+        self.classifier = GestureClassifier(autoload=False)
+        self.cursor_controller = None
+        self.pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="worker")
+        # Imports run for minutes; keep them off the pool that serves commands
+        self.import_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="import")
+        self.import_task = None
+        self.action_settings = {"buffer_size": 6, "cooldown": 1.2}
+
+        self.state = "warming"
+        self.ready = None  # asyncio.Event, created in run() on the serving loop
+        self.timings = {}
 
         self.clients = set()
-        self.camera = None
-        self.camera_on = False
-        self.camera_task = None
-
-        self.gestures = self._load_gestures()
+        self.subscriptions = {}  # ws -> subscription; see DEFAULT_SUBSCRIPTION
+        self.frame_pool = FramePool()  # shared by all camera sessions
+        self.frames_processed = 0
+        self.rss_samples = deque(maxlen=60)  # (frame_count, rss_mb), one per RSS_SAMPLE_EVERY frames
+        # Named local cameras; the default one drives cursor mode
+        self.cameras = {
+            DEFAULT_CAMERA: CameraSession(DEFAULT_CAMERA, self.classifier.cache, **self.action_settings),
+        }
+        self.profiler = None
+        self.shadow = None  # ShadowEvaluation of a candidate model, if one is running
+        self.flight = FlightRecorder()  # last few minutes of camera decisions
+        self._profile_timer = None
+        self.remote_sessions = {}  # (ws, session_id) -> RemoteSession
+        self.remote_task = None
+        self.remote_pool = None
+
+        # gestures.json is written only by the Node bridge; edits arrive as
+        # versioned commands and a full sync_gestures whenever versions differ
+        self.gestures, self.gestures_version = self._load_gestures()
         self.confidence_threshold = 0.55
+        self.augment = {"factor": 0, "mirror": False}  # training-time augmentation
         self.detection_overlay = True
         self.cursor_mode = False
 
-        log.info("GestureCtrl ML Service initialized")
+        METRICS.collect(self._collect_metrics)
+
+        log.info("GestureCtrl ML Service initialized (warming up in background)")
+
+    def _mark(self, name, since=_PROCESS_START):
+        """Record a startup milestone in milliseconds (first occurrence only)."""
+        if name not in self.timings:
+            self.timings[name] = round((time.perf_counter() - since) * 1000, 1)
+            log.info("Startup timing: %s = %.1f ms", name, self.timings[name])
+
+    def _warm_up_blocking(self):
+        """Heavy initialisation, run in the thread pool after the server listens."""
+        t0 = time.perf_counter()
+        _build_action_map()
+        self.cursor_controller = CursorController()
+        for gesture_data in list(self.gestures.values()):
+            self._register_cursor_gesture(gesture_data)
+        self.classifier.load()
+        detector = HandDetector()
+        # Dummy inference so the first real frame doesn't pay graph/JIT setup
+        detector.process(np.zeros((480, 640, 3), dtype=np.uint8))
+        model = self.classifier.model
+        if model is not None:
+            GestureClassifier._predict(model, np.zeros(63, dtype=np.float32), 1.0)
+        self.cameras[DEFAULT_CAMERA].detector = detector
+        self.timings["warmUpMs"] = round((time.perf_counter() - t0) * 1000, 1)
+
+    async def warm_up(self):
+        loop = asyncio.get_event_loop()
+        try:
+            await loop.run_in_executor(self.pool, self._warm_up_blocking)
+            self.state = "ready"
+            self._mark("readyMs")
+        except Exception as e:
+            self.state = "error"
+            log.error("Warm-up failed: %s", e)
+        finally:
+            self.ready.set()
+        await self.broadcast({
+            "type": "service_status",
+            "state": self.state,
+            "modelLoaded": self.classifier.model is not None,
+            "accuracy": round(self.classifier.accuracy * 100, 1),
+            "timings": self.timings,
+        })
 
     def _load_gestures(self):
+        """Initial (gestures, version) snapshot until the bridge syncs us."""
         if GESTURES_JSON.exists():
             try:
                 with open(GESTURES_JSON, "r") as f:
-                    return json.load(f)
+                    stored = json.load(f)
+                if isinstance(stored.get("version"), int) and "gestures" in stored:
+                    return stored["gestures"], stored["version"]
+                return stored, 0  # pre-versioning file: a bare {id: gesture} map
             except Exception:
                 pass
-        return {}
+        return {}, 0
+
+    async def _apply_gesture_version(self, ws, version):
+        """Adopt the version of an edit; ask for a full sync if one was missed."""
+        if version is None:
+            return
+        missed = version != self.gestures_version + 1
+        self.gestures_version = version
+        if missed:
+            log.info("Gesture edit v%s arrived out of order — requesting sync", version)
+            await ws.send(json.dumps({"type": "request_gesture_sync"}))
+
+    async def _broadcast_gestures(self):
+        await self.broadcast({
+            "type": "gesture_updated",
+            "gestures": self.gestures,
+            "version": self.gestures_version,
+        })
+
+    def _register_cursor_gesture(self, gesture_data):
+        if gesture_data.get("action") == "cursor_action" and gesture_data.get("cursorAction"):
+            if self.cursor_controller is not None:
+                self.cursor_controller.set_custom_gesture(
+                    gesture_data.get("name"), gesture_data.get("cursorAction")
+                )
 
-    def _save_gestures(self):
-        with open(GESTURES_JSON, "w") as f:
-            json.dump(self.gestures, f, indent=2)
+    def _route(self, label):
+        """(gesture_id, action_name) of the active gesture named ``label``."""
+        for gid, ginfo in self.gestures.items():
+            if ginfo.get("name") == label and ginfo.get("active", True):
+                return gid, ginfo.get("action", "none")
+        return None, None
+
+    def _model_stale(self):
+        """True when the loaded model was trained on a different gesture set."""
+        model = self.classifier.model
+        if model is None or model.meta_hash is None:
+            return False
+        return model.meta_hash != gesture_meta_hash(self.gestures)
 
     async def broadcast(self, message):
         """Send JSON message to all connected clients."""
@@ -737,74 +2654,211 @@ class GestureService:
                 dead.add(ws)
         self.clients -= dead
 
-    def _read_and_process_frame(self):
-        """Blocking work: read camera frame, flip, resize, run MediaPipe.
-        Called inside a ThreadPoolExecutor so it doesn't block asyncio."""
-        if self.camera is None:
+    def _subscription(self, ws):
+        return self.subscriptions.get(ws, DEFAULT_SUBSCRIPTION)
+
+    def _preview_plan(self):
+        """(fps, width) to encode previews at for all subscribers, or None if
+        nobody wants them. A None fps / width means unthrottled / full size."""
+        subs = [sub for sub in map(self._subscription, self.clients) if "preview" in sub["topics"]]
+        if not subs:
             return None
-        ret, frame = self.camera.read()
-        if not ret:
+        fps = [sub["previewFps"] for sub in subs]
+        width = [sub["previewWidth"] for sub in subs]
+        return (None if None in fps else max(fps)), (None if None in width else max(width))
+
+    async def _publish_frame(self, cam, frame_b64, detection, latency_ms, captured_at, raw_landmarks):
+        """Fan a processed frame out by subscription.
+
+        Preview subscribers get the ``frame`` (detection embedded) when one
+        was encoded; detection subscribers otherwise get a bare ``detection``;
+        landmark subscribers get a binary packet. Each is serialised once.
+        """
+        frame_msg = detection_msg = packet = None
+        dead = set()
+        for ws in self.clients:
+            topics = self._subscription(ws)["topics"]
+            out = []
+            if frame_b64 is not None and "preview" in topics:
+                if frame_msg is None:
+                    msg = {
+                        "type": "frame",
+                        "session": cam.name,
+                        "frame": f"data:image/jpeg;base64,{frame_b64}",
+                        "latencyMs": latency_ms,
+                    }
+                    if detection:
+                        msg["detection"] = detection
+                    frame_msg = json.dumps(msg)
+                out.append(frame_msg)
+            elif detection and "detections" in topics:
+                if detection_msg is None:
+                    detection_msg = json.dumps({
+                        "type": "detection",
+                        "session": cam.name,
+                        "detection": detection,
+                        "latencyMs": latency_ms,
+                    })
+                out.append(detection_msg)
+            if "landmarks" in topics:
+                if packet is None:
+                    wall = time.time() - (time.perf_counter() - captured_at)
+                    packet = pack_landmarks(cam.name, wall, raw_landmarks)
+                out.append(packet)
+            try:
+                for data in out:
+                    await ws.send(data)
+            except Exception:
+                dead.add(ws)
+        self.clients -= dead
+
+    def _camera(self, data):
+        """The CameraSession a command addresses (``session``, default camera if absent)."""
+        return self.cameras.get(str(data.get("session") or DEFAULT_CAMERA))
+
+    @property
+    def camera_on(self):
+        return any(cam.on for cam in self.cameras.values())
+
+    def _read_and_process_frame(self, cam, encode=True, width=None):
+        """Blocking work: take the newest grabbed frame, flip, resize, run MediaPipe.
+        Called on the session's worker thread so it doesn't block asyncio.
+
+        The annotated JPEG is only produced when ``encode`` is set (someone
+        wants a preview), scaled down to ``width`` if that is smaller.
+        """
+        grabber = cam.grabber
+        if grabber is None:
+            return None
+        t0 = time.perf_counter()
+        grabbed = grabber.read(timeout=0.5)
+        if grabbed is None:
             return None
-        frame = cv2.flip(frame, 1)
-        frame = cv2.resize(frame, (640, 480))
-        landmarks, raw_landmarks, annotated = self.detector.process(frame)
-        # Encode to JPEG here too (CPU work)
-        encode_params = [cv2.IMWRITE_JPEG_QUALITY, 70]
-        _, buf = cv2.imencode(".jpg", annotated, encode_params)
-        frame_b64 = base64.b64encode(buf).decode("utf-8")
-        return landmarks, raw_landmarks, frame_b64
-
-    async def camera_loop(self):
-        """Main frame capture + detection loop (non-blocking)."""
-        log.info("Camera loop started")
+        raw, captured_at = grabbed
+        import cv2
+        t1 = time.perf_counter()
+        pool = self.frame_pool
+        frame = cv2.flip(raw, 1, dst=pool.acquire(raw.shape))
+        pool.release(raw)
+        if (frame.shape[1], frame.shape[0]) != PROCESS_SIZE:
+            w, h = PROCESS_SIZE
+            resized = cv2.resize(frame, PROCESS_SIZE, dst=pool.acquire((h, w, frame.shape[2])))
+            pool.release(frame)
+            frame = resized
+        t2 = time.perf_counter()
+        frame_b64 = None
+        try:
+            landmarks, raw_landmarks, annotated = cam.detector.process(frame, draw=encode)
+            t3 = time.perf_counter()
+            if encode:
+                if width and width < annotated.shape[1]:
+                    h = round(annotated.shape[0] * width / annotated.shape[1])
+                    preview = cv2.resize(annotated, (width, h), dst=pool.acquire((h, width, annotated.shape[2])),
+                                         interpolation=cv2.INTER_AREA)
+                    pool.release(frame)
+                    frame = annotated = preview
+                # Encode to JPEG here too (CPU work); imencode/base64 own their output
+                encode_params = [cv2.IMWRITE_JPEG_QUALITY, 70]
+                _, buf = cv2.imencode(".jpg", annotated, encode_params)
+                frame_b64 = base64.b64encode(buf).decode("utf-8")
+        finally:
+            pool.release(frame)
+        t4 = time.perf_counter()
+        stages = [(t1 - t0) * 1000, (t2 - t1) * 1000, (t3 - t2) * 1000, (t4 - t3) * 1000]
+        self.M_CAPTURE_WAIT.observe(stages[0])
+        self.M_PREPROCESS.observe(stages[1])
+        self.M_DETECT.observe(stages[2])
+        self.M_ENCODE.observe(stages[3])
+        self.frames_processed += 1
+        if self.frames_processed % self.RSS_SAMPLE_EVERY == 1:
+            rss = current_rss_mb()
+            if rss is not None:
+                self.rss_samples.append((self.frames_processed, round(rss, 1)))
+        return landmarks, raw_landmarks, frame_b64, captured_at, stages
+
+    async def camera_loop(self, cam):
+        """Frame capture + detection loop for one camera session (non-blocking)."""
+        log.info("Camera loop started (%s)", cam.name)
         frame_interval = 1.0 / 25  # ~25 fps target
         loop = asyncio.get_event_loop()
+        last_frame_at = None
+        recorder, executor, trace = cam.recorder, cam.executor, cam.trace
 
-        while self.camera_on and self.camera is not None:
+        # cam.camera is briefly None while _reconfigure_camera swaps or
+        # reconfigures the device; reads just come back empty meanwhile
+        while cam.on:
             loop_start = time.time()
 
-            # Run blocking camera + MediaPipe work in a thread
+            # Only encode a preview when a subscriber wants one now
+            plan = self._preview_plan()
+            encode = plan is not None and (
+                plan[0] is None or loop_start - cam.last_preview >= 1.0 / plan[0]
+            )
+            if encode:
+                cam.last_preview = loop_start
+
+            # Run blocking camera + MediaPipe work on the session's worker
             result = await loop.run_in_executor(
-                self.pool, self._read_and_process_frame
+                cam.worker, self._read_and_process_frame, cam, encode, plan and plan[1]
             )
             if result is None:
-                await asyncio.sleep(0.01)
+                # Watchdog: reopen a device that stalled or keeps failing
+                grabber = cam.grabber
+                reason = grabber.stalled() if grabber is not None else None
+                if reason and cam.on:
+                    await self._recover_camera(cam, reason)
+                else:
+                    await asyncio.sleep(0.01)
                 continue
 
-            landmarks, raw_landmarks, frame_b64 = result
+            cam.backoff = 0.0
+            landmarks, raw_landmarks, frame_b64, captured_at, stages = result
             detection_info = None
+            classify_ms = 0.0
+            # Flight recorder row; the branches below fill in what applies
+            mode, label, confidence, action_name, fired, cooldown_left = 0, None, 0.0, None, None, 0.0
+            trace.n, trace.cached = 0, False
+            self.M_FRAMES.inc()
+            if last_frame_at is not None:
+                interval = loop_start - last_frame_at
+                if interval > 0:
+                    cam.fps = 1.0 / interval if not cam.fps else 0.9 * cam.fps + 0.1 / interval
+            last_frame_at = loop_start
 
             if landmarks is not None:
+                self.M_HANDS.inc()
+                if "firstDetectionMs" not in self.timings:
+                    self._mark("firstDetectionMs")
+                    self._mark("cameraToFirstDetectionMs", cam.started_at)
                 # RECORDING MODE: Always takes priority over everything else
-                if self.recorder.active:
-                    still_recording = self.recorder.save_sample(landmarks)
+                if recorder.active:
+                    mode = 3
+                    still_recording = recorder.save_sample(landmarks)
                     recording_msg = {
                         "type": "recording_progress",
-                        "id": self.recorder.gesture_id,
-                        "recorded": self.recorder.recorded,
-                        "total": self.recorder.total,
-                        "active": self.recorder.active,
+                        "session": cam.name,
+                        "id": recorder.gesture_id,
+                        "recorded": recorder.recorded,
+                        "total": recorder.total,
+                        "active": recorder.active,
+                        **recorder.progress(),
                     }
                     await self.broadcast(recording_msg)
-                    
+
                     # If recording just finished, check if it's a cursor gesture
-                    if not still_recording and self.gestures.get(self.recorder.gesture_id):
-                        gesture_data = self.gestures[self.recorder.gesture_id]
-                        if gesture_data.get("action") == "cursor_action" and gesture_data.get("cursorAction"):
-                            # Map the trained gesture to cursor action
-                            self.cursor_controller.set_custom_gesture(
-                                gesture_data.get("name"),
-                                gesture_data.get("cursorAction")
-                            )
-                
-                # CURSOR MODE: Control mouse with finger (only if not recording)
-                elif self.cursor_mode and raw_landmarks:
+                    if not still_recording and self.gestures.get(recorder.gesture_id):
+                        self._register_cursor_gesture(self.gestures[recorder.gesture_id])
+
+                # CURSOR MODE: Control mouse with finger (only if not recording);
+                # one desktop pointer, so only the default camera drives it
+                elif self.cursor_mode and raw_landmarks and cam.name == DEFAULT_CAMERA:
+                    mode = 2
                     try:
                         self.cursor_controller.move_cursor(raw_landmarks)
-                        
+
                         # Check for custom trained gestures first
                         label, confidence = self.classifier.predict(
-                            landmarks, self.confidence_threshold
+                            landmarks, self.confidence_threshold, cam.cache, trace
                         )
                         if label:
                             # Check if this is a custom cursor gesture
@@ -824,23 +2878,31 @@ class GestureService:
 
                 # GESTURE PREDICTION MODE (only if not recording and not in cursor mode)
                 else:
+                    mode = 1
+                    t_classify = time.perf_counter()
                     label, confidence = self.classifier.predict(
-                        landmarks, self.confidence_threshold
+                        landmarks, self.confidence_threshold, cam.cache, trace
                     )
+                    classify_ms = (time.perf_counter() - t_classify) * 1000
+                    self.M_CLASSIFY.observe(classify_ms)
+                    self.M_PREDICTIONS.inc()
+                    shadow = self.shadow
+                    if shadow is not None:
+                        shadow.offer(landmarks, self.confidence_threshold)
+                        if shadow.due:
+                            shadow.busy = True
+                            asyncio.ensure_future(self._run_shadow(shadow))
+                    if not label:
+                        self.M_REJECTED.inc()
                     if label:
-                        # Find matching gesture for this label
-                        action_name = None
-                        gesture_id = None
-                        for gid, ginfo in self.gestures.items():
-                            if ginfo.get("name") == label and ginfo.get("active", True):
-                                action_name = ginfo.get("action", "none")
-                                gesture_id = gid
-                                break
+                        gesture_id, action_name = self._route(label)
 
                         if action_name and action_name != "none":
-                            fired = self.executor.feed(label, action_name, self.gestures)
-                        else:
-                            fired = None
+                            cooldown_left = executor.cooldown_left(action_name)
+                            fired = executor.feed(label, action_name, self.gestures)
+                        if fired is not None:
+                            self.M_FIRED.inc()
+                            self.M_ACTION_LATENCY.observe((time.perf_counter() - captured_at) * 1000)
 
                         detection_info = {
                             "gesture": label,
@@ -851,21 +2913,33 @@ class GestureService:
                         }
 
             # Broadcast frame + detection
-            msg = {
-                "type": "frame",
-                "frame": f"data:image/jpeg;base64,{frame_b64}",
-            }
+            latency_ms = round((time.perf_counter() - captured_at) * 1000, 1)
+            cam.frame_latency.append(latency_ms)
+            self.M_LATENCY.observe(latency_ms)
             if detection_info:
-                msg["detection"] = detection_info
+                detection_info["latencyMs"] = latency_ms
+            self.flight.record(
+                loop_start, cam.name, mode, landmarks, trace, label, confidence,
+                self.confidence_threshold, executor, action_name, cooldown_left,
+                fired is not None, latency_ms,
+            )
 
-            await self.broadcast(msg)
+            t_send = time.perf_counter()
+            await self._publish_frame(cam, frame_b64, detection_info, latency_ms,
+                                      captured_at, raw_landmarks)
+            broadcast_ms = (time.perf_counter() - t_send) * 1000
+            self.M_BROADCAST.observe(broadcast_ms)
+            profiler = self.profiler
+            if profiler is not None and profiler.active:
+                profiler.record_frame(stages + [classify_ms, broadcast_ms], latency_ms)
 
             # Frame rate control
             elapsed = time.time() - loop_start
             sleep_time = max(0, frame_interval - elapsed)
             await asyncio.sleep(sleep_time)
 
-        log.info("Camera loop stopped")
+        cam.fps = 0.0
+        log.info("Camera loop stopped (%s)", cam.name)
 
     async def handle_command(self, ws, message):
         """Process an incoming WebSocket command."""
@@ -875,16 +2949,73 @@ class GestureService:
             return
 
         cmd = data.get("type", "")
-        log.info("Command received: %s", cmd)
+        # Polled commands would otherwise flood the log
+        log.log(logging.DEBUG if cmd in self.QUIET_COMMANDS else logging.INFO, "Command received: %s", cmd)
+
+        if cmd not in self.COLD_COMMANDS and not self.ready.is_set():
+            await self.ready.wait()
+        if self.state == "error" and cmd not in self.COLD_COMMANDS:
+            await ws.send(json.dumps({
+                "type": "error",
+                "message": "ML service failed to initialise — check the service log",
+            }))
+            return
 
         if cmd == "camera_start":
-            # Force close if it thinks it's on but stuck
-            if self.camera_on or self.camera is not None:
-                await self._close_camera()
-            await self._open_camera(ws)
+            name = str(data.get("session") or DEFAULT_CAMERA)
+            try:
+                requested = parse_camera_config(data)
+            except ValueError as e:
+                await ws.send(json.dumps({"type": "error", "session": name, "message": str(e)}))
+                return
+            cam = self.cameras.get(name)
+            created = cam is None
+            if created:
+                cam = self.cameras[name] = CameraSession(
+                    name, self.classifier.new_cache(), **self.action_settings
+                )
+            changes = {key: value for key, value in requested.items() if value != cam.config.get(key)}
+            previous_index = cam.config.get("index", 0)
+            cam.config.update(changes)
+            if cam.on and cam.camera is not None and cam.task is not None and not cam.task.done():
+                # Running: keep the loop and detector, re-apply settings in place
+                await self._reconfigure_camera(cam, changes, previous_index, ws)
+            else:
+                # Force close if it thinks it's on but stuck
+                if cam.on or cam.camera is not None:
+                    await self._close_camera(cam)
+                if not await self._open_camera(cam, ws) and created:
+                    # A session whose device never opened is not kept around
+                    await self._drop_camera(cam)
 
         elif cmd == "camera_stop":
-            await self._close_camera()
+            cam = self._camera(data)
+            if cam is not None:
+                await self._close_camera(cam)
+                await self._drop_camera(cam)
+
+        elif cmd == "subscribe":
+            topics = frozenset(data.get("topics") or ()) & frozenset(TOPICS)
+            try:
+                fps = float(data.get("previewFps") or 0)
+                width = int(data.get("previewWidth") or 0)
+            except (TypeError, ValueError):
+                fps = width = 0
+            sub = {
+                "topics": topics,
+                "previewFps": fps if fps > 0 else None,
+                "previewWidth": width if width >= 64 else None,
+            }
+            self.subscriptions[ws] = sub
+            log.info("Subscription: %s", ", ".join(sorted(topics)) or "(none)")
+            await ws.send(json.dumps({"type": "subscribed", **sub, "topics": sorted(topics)}))
+
+        elif cmd == "list_cameras":
+            await ws.send(json.dumps({
+                "type": "cameras",
+                "cameras": {name: {"active": cam.on, "config": cam.config}
+                            for name, cam in self.cameras.items()},
+            }))
 
         elif cmd == "toggle_cursor_mode":
             self.cursor_mode = data.get("enabled", not self.cursor_mode)
@@ -903,74 +3034,90 @@ class GestureService:
             })
             log.info("Cursor settings updated")
 
-        elif cmd == "add_gesture":
+        elif cmd in ("add_gesture", "update_gesture"):
             gid = data.get("id")
             gesture_data = data.get("data", {})
             if gid:
                 self.gestures[gid] = gesture_data
-                self._save_gestures()
-                
-                # Check if this is a cursor gesture
-                if gesture_data.get("action") == "cursor_action":
-                    cursor_action = gesture_data.get("cursorAction")
-                    if cursor_action:
-                        self.cursor_controller.set_custom_gesture(
-                            gesture_data.get("name"), cursor_action
-                        )
-                
-                await self.broadcast({
-                    "type": "gesture_updated",
-                    "gestures": self.gestures,
-                })
+                self._register_cursor_gesture(gesture_data)
+                await self._apply_gesture_version(ws, data.get("version"))
+                await self._broadcast_gestures()
 
         elif cmd == "delete_gesture":
             gid = data.get("id")
             if gid and gid in self.gestures:
                 del self.gestures[gid]
-                self._save_gestures()
-                # Delete samples
+                # Delete samples (the bridge removes them too; either may run first)
                 sample_dir = GESTURES_DIR / gid
                 if sample_dir.exists():
                     import shutil
-                    shutil.rmtree(sample_dir)
-                await self.broadcast({
-                    "type": "gesture_updated",
-                    "gestures": self.gestures,
-                })
+                    shutil.rmtree(sample_dir, ignore_errors=True)
+            await self._apply_gesture_version(ws, data.get("version"))
+            await self._broadcast_gestures()
 
         elif cmd == "toggle_gesture":
             gid = data.get("id")
             active = data.get("active", True)
             if gid and gid in self.gestures:
                 self.gestures[gid]["active"] = active
-                self._save_gestures()
-                await self.broadcast({
-                    "type": "gesture_updated",
-                    "gestures": self.gestures,
-                })
+            await self._apply_gesture_version(ws, data.get("version"))
+            await self._broadcast_gestures()
+
+        elif cmd == "sync_gestures":
+            self.gestures = data.get("gestures") or {}
+            self.gestures_version = data.get("version", 0)
+            for gesture_data in self.gestures.values():
+                self._register_cursor_gesture(gesture_data)
+            log.info("Gestures synced from bridge (v%d, %d gestures)",
+                     self.gestures_version, len(self.gestures))
+            await self._broadcast_gestures()
 
         elif cmd == "start_recording":
             gid = data.get("id")
             total = data.get("total", 80)
-            if gid:
+            min_distance = data.get("minDistance")
+            if min_distance is not None:
+                try:
+                    min_distance = min(max(float(min_distance), 0.0), 1.0)
+                except (TypeError, ValueError):
+                    await ws.send(json.dumps({"type": "error", "message": "minDistance must be a number"}))
+                    return
+            cam = self._camera(data)
+            if gid and cam is not None:
                 # Auto-start camera if not already on
-                if not self.camera_on:
-                    await self._open_camera(ws)
-                self.recorder.start(gid, total)
+                if not cam.on:
+                    await self._open_camera(cam, ws)
+                cam.recorder.start(gid, total, min_distance)
                 await self.broadcast({
                     "type": "recording_started",
+                    "session": cam.name,
                     "id": gid,
                     "total": total,
                 })
 
         elif cmd == "stop_recording":
-            self.recorder.stop()
-            await self.broadcast({
-                "type": "recording_stopped",
-                "recorded": self.recorder.recorded,
-            })
+            # Without a session, stop whichever cameras are recording
+            if data.get("session"):
+                cams = [c for c in [self._camera(data)] if c is not None]
+            else:
+                cams = [c for c in self.cameras.values() if c.recorder.active] or [self.cameras[DEFAULT_CAMERA]]
+            for cam in cams:
+                cam.recorder.stop()
+                await self.broadcast({
+                    "type": "recording_stopped",
+                    "session": cam.name,
+                    "recorded": cam.recorder.recorded,
+                    **cam.recorder.progress(),
+                })
 
         elif cmd == "retrain":
+            augment = dict(self.augment)
+            try:
+                if "augment" in data:
+                    augment["factor"] = augment_factor(data["augment"])
+            except ValueError as e:
+                await ws.send(json.dumps({"type": "error", "message": str(e)}))
+                return
             await self.broadcast({"type": "train_progress", "progress": 0, "status": "Starting..."})
             loop = asyncio.get_event_loop()
 
@@ -985,9 +3132,14 @@ class GestureService:
                     loop,
                 )
 
+            if "mirror" in data:
+                augment["mirror"] = bool(data["mirror"])
+            # Shadow: evaluate the new model on live data before it takes over
+            shadow = bool(data.get("shadow"))
+
             accuracy = await loop.run_in_executor(
                 self.pool,
-                self.classifier.train,
+                functools.partial(self.classifier.train, augment=augment, activate=not shadow),
                 self.gestures,
                 progress_cb,
             )
@@ -995,7 +3147,68 @@ class GestureService:
             await self.broadcast({
                 "type": "train_complete",
                 "accuracy": round(accuracy * 100, 1),
+                "shadow": shadow,
             })
+            if shadow and self.classifier.candidate is not None:
+                await self._start_shadow(self.classifier.candidate, "retrain")
+
+        elif cmd == "shadow_model":
+            # Shadow a model saved elsewhere (e.g. trained on another machine)
+            path = data.get("path")
+            try:
+                model = await asyncio.get_event_loop().run_in_executor(
+                    self.pool, lambda: KNNModel.load(path).warm())
+            except Exception as e:
+                await ws.send(json.dumps({"type": "error", "message": f"Could not load model: {e}"}))
+                return
+            await self._start_shadow(model, str(path))
+
+        elif cmd == "shadow_status":
+            await ws.send(json.dumps({
+                "type": "shadow_report",
+                "report": self.shadow.report() if self.shadow else None,
+            }))
+
+        elif cmd == "stop_shadow":
+            self.shadow = None
+            await self.broadcast({"type": "shadow_report", "report": None})
+
+        elif cmd == "promote_model":
+            if self.shadow is None:
+                await ws.send(json.dumps({"type": "error", "message": "No candidate model to promote"}))
+                return
+            await self._activate(self.shadow.candidate)
+
+        elif cmd == "rollback_model":
+            if self.classifier.previous is None:
+                await ws.send(json.dumps({"type": "error", "message": "No previous model to roll back to"}))
+                return
+            await self._activate(None)
+
+        elif cmd == "import_samples":
+            # {"sources": {gesture_id: [paths]}} or {"id": gesture_id, "paths": [...]}
+            sources = dict(data.get("sources") or {})
+            if data.get("id") and data.get("paths"):
+                sources[data["id"]] = data["paths"]
+            if self.import_task is not None and not self.import_task.done():
+                await ws.send(json.dumps({"type": "error", "message": "An import is already running"}))
+                return
+            try:
+                stride = max(1, int(data.get("stride", 1)))
+                min_distance = data.get("minDistance")
+                min_distance = None if min_distance is None else float(min_distance)
+            except (TypeError, ValueError):
+                await ws.send(json.dumps({"type": "error", "message": "stride and minDistance must be numbers"}))
+                return
+            for gid in list(sources):
+                if gid not in self.gestures:
+                    await ws.send(json.dumps({"type": "error", "message": f"Unknown gesture {gid}"}))
+                    del sources[gid]
+            if sources:
+                # Runs in the background; progress arrives as import_progress / import_complete
+                self.import_task = asyncio.create_task(self._import_samples(
+                    sources, stride=stride, flip=data.get("flip", True), min_distance=min_distance,
+                ))
 
         elif cmd == "get_stats":
             total_samples = 0
@@ -1009,95 +3222,664 @@ class GestureService:
                 "totalGestures": len(self.gestures),
                 "totalSamples": total_samples,
                 "modelLoaded": self.classifier.model is not None,
+                "modelStale": self._model_stale(),
+                "predictionCache": self.classifier.cache_stats(),
+                "state": self.state,
+                "timings": self.timings,
+                "camera": self._camera_stats(self.cameras[DEFAULT_CAMERA]),
+                "cameras": {name: self._camera_stats(cam) for name, cam in self.cameras.items()},
+                "remote": self._remote_stats(),
+                "shadow": self.shadow.report() if self.shadow else None,
+                "canRollback": self.classifier.previous is not None,
             }))
 
+        elif cmd == "dump_flight":
+            seconds = data.get("seconds")
+            if seconds is not None:
+                try:
+                    seconds = clamp_number(seconds, 0.1, 3600.0)
+                except ValueError as e:
+                    await ws.send(json.dumps({"type": "error", "message": f"Flight dump seconds: {e}"}))
+                    return
+            snapshot = self.flight.snapshot(seconds)
+            frames = len(snapshot["time"])
+            if not frames:
+                await ws.send(json.dumps({"type": "error", "message": "Flight recorder is empty"}))
+                return
+            try:
+                path = await asyncio.get_event_loop().run_in_executor(
+                    self.pool, FlightRecorder.dump, snapshot
+                )
+            except OSError as e:
+                await ws.send(json.dumps({"type": "error", "message": f"Could not write flight dump: {e}"}))
+                return
+            span = float(snapshot["time"][-1] - snapshot["time"][0])
+            log.info("Flight dump: %d frames (%.1f s) -> %s", frames, span, path)
+            await self.broadcast({
+                "type": "flight_dump", "file": str(path), "frames": frames, "seconds": round(span, 2),
+            })
+
+        elif cmd == "start_profile":
+            if self.profiler is not None and self.profiler.active:
+                await ws.send(json.dumps({"type": "error", "message": "A profile is already running"}))
+                return
+            try:
+                seconds = clamp_number(data.get("seconds", 10), 1.0, PROFILE_MAX_SECONDS)
+                interval = clamp_number(data.get("intervalMs", 5), 1.0, 100.0) / 1000
+            except ValueError as e:
+                await ws.send(json.dumps({"type": "error", "message": f"Profile settings: {e}"}))
+                return
+            self.profiler = SamplingProfiler(interval)
+            self.profiler.start()
+            self._profile_timer = asyncio.get_event_loop().call_later(
+                seconds, lambda: asyncio.ensure_future(self._finish_profile())
+            )
+            log.info("Profiling for %.0f s (sampling every %.0f ms)", seconds, interval * 1000)
+            await self.broadcast({"type": "profile_started", "seconds": seconds})
+
+        elif cmd == "stop_profile":
+            await self._finish_profile()
+
+        elif cmd == "remote_start":
+            sid = str(data.get("session", "default"))
+            key = (ws, sid)
+            if key not in self.remote_sessions:
+                self.remote_sessions[key] = RemoteSession(
+                    ws, sid,
+                    flip=data.get("flip", True),
+                    **self.action_settings,
+                )
+                log.info("Remote session '%s' started (%d active)", sid, len(self.remote_sessions))
+            if self.remote_task is None or self.remote_task.done():
+                self.remote_task = asyncio.create_task(self.remote_loop())
+            await ws.send(json.dumps({"type": "remote_session", "session": sid, "active": True}))
+
+        elif cmd == "remote_stop":
+            sid = str(data.get("session", "default"))
+            session = self.remote_sessions.pop((ws, sid), None)
+            if session is not None:
+                session.close()
+                await ws.send(json.dumps({"type": "remote_session", "session": sid, "active": False}))
+
+        elif cmd in ("remote_frame", "remote_landmarks"):
+            sid = str(data.get("session", "default"))
+            session = self.remote_sessions.get((ws, sid))
+            if session is None:
+                await ws.send(json.dumps({
+                    "type": "error",
+                    "session": sid,
+                    "remote": True,
+                    "message": "Unknown remote session; send remote_start first",
+                }))
+                return
+            session.last_seen = time.monotonic()
+            session.frames += 1
+            if cmd == "remote_landmarks":
+                try:
+                    vector = normalise_landmarks(data["landmarks"])
+                except (KeyError, ValueError, TypeError):
+                    return
+                session.pending, session.pending_at = vector, time.perf_counter()
+            elif session.busy:
+                session.dropped += 1  # newest-wins: the client is ahead of us
+            else:
+                asyncio.create_task(self._detect_remote(session, data.get("frame", "")))
+
+        elif cmd == "get_metrics":
+            await ws.send(json.dumps({"type": "metrics", "metrics": METRICS.snapshot()}))
+
         elif cmd == "update_settings":
             if "confidenceThreshold" in data:
                 self.confidence_threshold = data["confidenceThreshold"] / 100.0
+            executors = [c.executor for c in self.cameras.values()]
+            executors += [r.executor for r in self.remote_sessions.values()]
             if "cooldown" in data:
-                self.executor.cooldown_duration = data["cooldown"] / 1000.0
+                self.action_settings["cooldown"] = data["cooldown"] / 1000.0
+                for executor in executors:
+                    executor.cooldown_duration = self.action_settings["cooldown"]
+            if "augmentFactor" in data:
+                try:
+                    self.augment["factor"] = augment_factor(data["augmentFactor"])
+                except ValueError as e:
+                    await ws.send(json.dumps({"type": "error", "message": str(e)}))
+                    return
+            if "augmentMirror" in data:
+                self.augment["mirror"] = bool(data["augmentMirror"])
             if "bufferSize" in data:
-                old_buf = list(self.executor.buffer)
-                self.executor.buffer = deque(old_buf, maxlen=data["bufferSize"])
+                self.action_settings["buffer_size"] = data["bufferSize"]
+                for executor in executors:
+                    executor.buffer = deque(executor.buffer, maxlen=data["bufferSize"])
             await ws.send(json.dumps({"type": "settings_updated", "status": "ok"}))
 
         elif cmd == "get_gestures":
             await ws.send(json.dumps({
                 "type": "gesture_updated",
                 "gestures": self.gestures,
+                "version": self.gestures_version,
             }))
 
     async def handler(self, ws, path=None):
         """WebSocket connection handler."""
+        from websockets.exceptions import ConnectionClosed
         self.clients.add(ws)
+        self._mark("firstConnectionMs")
         log.info("Client connected (%d total)", len(self.clients))
 
         # Send initial state
         await ws.send(json.dumps({
             "type": "connected",
             "gestures": self.gestures,
-            "cameraOn": self.camera_on,
+            "gesturesVersion": self.gestures_version,
+            "cameraOn": self.cameras[DEFAULT_CAMERA].on,
+            "cameras": {name: cam.on for name, cam in self.cameras.items()},
             "modelLoaded": self.classifier.model is not None,
             "accuracy": round(self.classifier.accuracy * 100, 1),
+            "state": self.state,
+            "timings": self.timings,
         }))
 
         try:
             async for message in ws:
                 await self.handle_command(ws, message)
-        except websockets.exceptions.ConnectionClosed:
+        except ConnectionClosed:
             pass
         finally:
             self.clients.discard(ws)
+            self.subscriptions.pop(ws, None)
+            for key in [k for k in self.remote_sessions if k[0] is ws]:
+                self.remote_sessions.pop(key).close()
             log.info("Client disconnected (%d remaining)", len(self.clients))
 
-    async def _open_camera(self, ws=None):
-        """Open the camera with platform-appropriate backend."""
+    async def _detect_remote(self, session, payload):
+        session.busy = True
+        loop = asyncio.get_event_loop()
+        t0 = time.perf_counter()
+        try:
+            if self.remote_pool is None:
+                # Separate from self.pool so remote users can't starve the local camera
+                self.remote_pool = ThreadPoolExecutor(
+                    max_workers=os.cpu_count() or 2, thread_name_prefix="remote")
+            vector = await loop.run_in_executor(self.remote_pool, session.detect, payload)
+        except Exception as e:
+            log.debug("Remote frame error (%s): %s", session.session_id, e)
+            vector = None
+        finally:
+            session.busy = False
+            if session.closed:
+                session.close()
+        self.M_REMOTE_DETECT.observe((time.perf_counter() - t0) * 1000)
+        if vector is not None:
+            session.pending, session.pending_at = vector, t0
+
+    async def remote_loop(self):
+        """Every tick, classify all sessions' newest vectors in one batched call."""
+        log.info("Remote classification loop started")
+        while self.remote_sessions:
+            tick_start = time.perf_counter()
+            now = time.monotonic()
+            for key, session in list(self.remote_sessions.items()):
+                if now - session.last_seen > REMOTE_IDLE_TIMEOUT:
+                    log.info("Remote session '%s' timed out", session.session_id)
+                    session.close()
+                    del self.remote_sessions[key]
+                    try:
+                        await session.ws.send(json.dumps({
+                            "type": "remote_session", "session": session.session_id,
+                            "active": False, "reason": "timeout",
+                        }))
+                    except Exception:
+                        pass  # connection gone; handler() drops its sessions
+
+            batch = [s for s in self.remote_sessions.values() if s.pending is not None]
+            model = self.classifier.model
+            if batch and model is not None:
+                Q = np.stack([s.pending for s in batch])
+                stamps = [s.pending_at for s in batch]
+                for s in batch:
+                    s.pending = None
+                dist, idx = model.kneighbors(Q)
+                best, confidence = model.decide(dist, idx, self.confidence_threshold)
+                self.M_REMOTE_BATCH.observe(len(batch))
+                self.M_REMOTE_TICK.observe((time.perf_counter() - tick_start) * 1000)
+                for session, b, conf, stamp in zip(batch, best, confidence, stamps):
+                    await self._report_remote(session, model, int(b), float(conf), stamp)
+
+            elapsed = time.perf_counter() - tick_start
+            await asyncio.sleep(max(0.0, REMOTE_TICK - elapsed))
+        log.info("Remote classification loop stopped")
+
+    async def _report_remote(self, session, model, best, confidence, stamp):
+        if best < 0:
+            return
+        label = model.classes[best]
+        gesture_id, action_name = self._route(label)
+        fired = None
+        if action_name and action_name != "none":
+            fired = session.executor.feed(label, action_name, self.gestures)
+        try:
+            await session.ws.send(json.dumps({
+                "type": "remote_detection",
+                "session": session.session_id,
+                "detection": {
+                    "gesture": label,
+                    "gestureId": gesture_id,
+                    "confidence": round(confidence, 3),
+                    "action": action_name,
+                    "fired": fired is not None,
+                    "latencyMs": round((time.perf_counter() - stamp) * 1000, 1),
+                },
+            }))
+        except Exception:
+            pass  # connection gone; handler() drops its sessions
+
+    def _remote_stats(self):
+        """Session counts and an estimate of how many sessions one core sustains."""
+        stats = {"sessions": len(self.remote_sessions)}
+        if self.remote_sessions:
+            stats["dropped"] = sum(s.dropped for s in self.remote_sessions.values())
+        detect, tick, batch = self.M_REMOTE_DETECT, self.M_REMOTE_TICK, self.M_REMOTE_BATCH
+        if detect.count or tick.count:
+            # Core-ms each session needs per second at 25 fps: its own detection
+            # (skipped for landmark clients) plus its share of the batched predict
+            per_frame = detect.sum / detect.count if detect.count else 0.0
+            per_classify = tick.sum / batch.sum if batch.sum else 0.0
+            cost_ms = (per_frame + per_classify) / REMOTE_TICK
+            stats["perSessionMs"] = round(per_frame + per_classify, 2)
+            if cost_ms > 0:
+                stats["sessionsPerCore"] = int(1000 / cost_ms)
+        return stats
+
+    async def _start_shadow(self, model, source):
+        self.shadow = ShadowEvaluation(model, source)
+        log.info("Shadow evaluation started (%s, %d samples)", source, len(model))
+        await self.broadcast({"type": "shadow_report", "report": self.shadow.report()})
+
+    async def _run_shadow(self, shadow):
+        """Evaluate the queued vectors on a worker; report every few seconds."""
+        try:
+            await asyncio.get_event_loop().run_in_executor(
+                self.pool, shadow.evaluate, self.classifier.model)
+        except Exception as e:
+            log.warning("Shadow evaluation failed: %s", e)
+        finally:
+            shadow.busy = False
+        now = time.monotonic()
+        if shadow is self.shadow and now - shadow.reported_at >= SHADOW_REPORT_EVERY:
+            shadow.reported_at = now
+            await self.broadcast({"type": "shadow_report", "report": shadow.report()})
+
+    async def _activate(self, model):
+        """Promote ``model``, or roll back when it is None, then persist it.
+
+        The swap is a single attribute store on the event loop, so the
+        camera loop uses the new model from its next frame. A loaded model is
+        warmed up first and the active model written to disk afterwards, both
+        on a worker.
+        """
+        loop = asyncio.get_event_loop()
+        if model is None:
+            model = self.classifier.rollback()
+            event = "model_rolled_back"
+        else:
+            await loop.run_in_executor(self.pool, model.warm)
+            self.classifier.promote(model)
+            self.shadow = None
+            event = "model_promoted"
+        log.info("Model %s (accuracy %.1f%%, %d samples)",
+                 event.split("_", 1)[1].replace("_", " "), model.accuracy * 100, len(model))
+        await self.broadcast({
+            "type": event,
+            "accuracy": round(model.accuracy * 100, 1),
+            "samples": len(model),
+            "canRollback": self.classifier.previous is not None,
+        })
+        try:
+            await loop.run_in_executor(self.pool, self.classifier.persist)
+        except OSError as e:
+            log.warning("Could not save the active model: %s", e)
+
+    async def _import_samples(self, sources, **options):
+        """Import recordings for each gesture in ``sources``, one gesture at a time."""
+        loop = asyncio.get_event_loop()
+        for gid, paths in sources.items():
+
+            def import_progress(done, total, kept, examined, gid=gid):
+                asyncio.run_coroutine_threadsafe(
+                    self.broadcast({
+                        "type": "import_progress",
+                        "id": gid,
+                        "done": done,
+                        "total": total,
+                        "samplesAdded": kept,
+                        "framesExamined": examined,
+                    }),
+                    loop,
+                )
+
+            try:
+                summary = await loop.run_in_executor(
+                    self.import_pool,
+                    functools.partial(import_samples, gid, paths,
+                                      progress_callback=import_progress, **options),
+                )
+            except Exception as e:
+                log.exception("Import for gesture '%s' failed", gid)
+                await self.broadcast({"type": "error", "message": f"Import for {gid} failed: {e}"})
+                continue
+            sample_dir = GESTURES_DIR / gid
+            summary["totalSamples"] = len(list(sample_dir.glob("*.npy")))
+            await self.broadcast({"type": "import_complete", **summary})
+
+    async def _finish_profile(self):
+        """Stop the running profile, save it and broadcast its summary."""
+        profiler = self.profiler
+        if profiler is None or not profiler.active:
+            return
+        if self._profile_timer is not None:
+            self._profile_timer.cancel()
+            self._profile_timer = None
+        loop = asyncio.get_event_loop()
+        profiler.stop()
+        try:
+            files = await loop.run_in_executor(self.pool, profiler.save)
+        except OSError as e:
+            log.warning("Could not save profile: %s", e)
+            files = None
+        summary = profiler.summary()
+        log.info("Profile complete: %d samples, %d frames", summary["samples"], summary["frames"])
+        await self.broadcast({"type": "profile_complete", "files": files, "summary": summary})
+
+    def _collect_metrics(self):
+        """Mirror state owned by other components into gauges before a snapshot."""
+        gauge = METRICS.gauge
+        gauge("clients", "Connected WebSocket clients").set(len(self.clients))
+        gauge("remote_sessions", "Active remote camera sessions").set(len(self.remote_sessions))
+        cams = [c for c in self.cameras.values() if c.on]
+        gauge("camera_on", "1 while any camera loop runs").set(int(bool(cams)))
+        gauge("cameras_active", "Camera sessions running").set(len(cams))
+        gauge("dropped_frames", "Frames overwritten before processing (running cameras)").set(
+            sum(c.grabber.dropped for c in cams if c.grabber is not None))
+        self.M_FPS.set(round(sum(c.fps for c in cams), 2))
+        cache = self.classifier.cache_stats()
+        gauge("prediction_cache_hits", "Predictions served from the temporal cache").set(cache["hits"])
+        gauge("prediction_cache_misses", "Predictions that ran the classifier").set(cache["misses"])
+        gauge("frame_pool_allocations", "Frame buffers allocated by the pool").set(self.frame_pool.allocations)
+        if self.rss_samples:
+            gauge("rss_mb", "Resident set size (sampled)").set(self.rss_samples[-1][1])
+
+    def _camera_stats(self, cam):
+        latencies = sorted(cam.frame_latency)
+        stats = {
+            "config": cam.config, "active": cam.on, "state": cam.state, "fps": round(cam.fps, 1),
+            "restarts": cam.restarts, "lastRecoveryMs": cam.last_recovery_ms,
+        }
+        if cam.grabber is not None:
+            stats["droppedFrames"] = cam.grabber.dropped
+        pool = self.frame_pool.stats()
+        if self.frames_processed:
+            pool["allocationsPerFrame"] = round(pool["allocations"] / self.frames_processed, 4)
+        stats["framePool"] = pool
+        if self.rss_samples:
+            first, last = self.rss_samples[0], self.rss_samples[-1]
+            stats["memory"] = {
+                "rssMb": last[1],
+                "rssDriftMb": round(last[1] - first[1], 1),
+                "overFrames": last[0] - first[0],
+            }
+        if latencies:
+            stats["latencyMs"] = {
+                "mean": round(sum(latencies) / len(latencies), 1),
+                "p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+            }
+        return stats
+
+    def _configure_capture(self, capture, cfg):
+        """Request resolution / fps / codec from the device and log what it granted."""
+        import cv2
+        if cfg.get("fourcc"):
+            capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*cfg["fourcc"][:4]))
+        capture.set(cv2.CAP_PROP_FRAME_WIDTH, cfg["width"])
+        capture.set(cv2.CAP_PROP_FRAME_HEIGHT, cfg["height"])
+        capture.set(cv2.CAP_PROP_FPS, cfg["fps"])
+        capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        log.info(
+            "Camera granted %dx%d @ %.0f fps",
+            capture.get(cv2.CAP_PROP_FRAME_WIDTH),
+            capture.get(cv2.CAP_PROP_FRAME_HEIGHT),
+            capture.get(cv2.CAP_PROP_FPS),
+        )
+
+    def _open_capture(self, cfg):
+        """Open and configure the device in ``cfg`` (blocking). None if it won't open."""
+        import cv2
+        index = cfg.get("index", 0)
         if platform.system() == "Windows":
-            self.camera = cv2.VideoCapture(0, cv2.CAP_DSHOW)
+            capture = cv2.VideoCapture(index, cv2.CAP_DSHOW)
         else:
-            self.camera = cv2.VideoCapture(0)
-        if self.camera.isOpened():
-            self.camera_on = True
-            self.camera_task = asyncio.create_task(self.camera_loop())
-            await self.broadcast({"type": "camera_status", "active": True})
-            log.info("Camera started")
+            capture = cv2.VideoCapture(index)
+        if not capture.isOpened():
+            capture.release()
+            return None
+        self._configure_capture(capture, cfg)
+        return capture
+
+    @staticmethod
+    def _release_capture(capture, grabber=None):
+        """Release a device without waiting on it; a hung driver can block release().
+
+        With a stopped ``grabber``, release happens only once its thread is out
+        of grab(), never underneath it.
+        """
+        if capture is None:
+            return
+
+        def release():
+            if grabber is not None:
+                grabber.join()
+            capture.release()
+
+        threading.Thread(target=release, name="capture-release", daemon=True).start()
+
+    async def _open_capture_async(self, cam):
+        """_open_capture for ``cam.config`` on the session's worker (never queued
+        behind training on the shared pool); if we're cancelled meanwhile, the
+        device is released."""
+        future = asyncio.get_event_loop().run_in_executor(cam.worker, self._open_capture, cam.config)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            future.add_done_callback(
+                lambda f: f.cancelled() or f.exception() or self._release_capture(f.result()))
+            raise
+
+    def _attach_capture(self, cam, capture):
+        cam.camera = capture
+        cam.grabber = FrameGrabber(capture, self.frame_pool)
+        cam.grabber.start()
+        cam.state = "running"
+
+    def _detach_capture(self, cam, release=False):
+        """Stop the grabber and take the device off the session (the loop keeps running).
+
+        Returns (device, stopped grabber) — its thread may still be inside a
+        grab, so ``join()`` it before touching the device again — or with
+        ``release`` releases the device in the background once it is free.
+        """
+        grabber, cam.grabber = cam.grabber, None
+        if grabber is not None:
+            grabber.stop(timeout=0.2)
+        capture, cam.camera = cam.camera, None
+        if release:
+            self._release_capture(capture, grabber)
+            return None, None
+        return capture, grabber
+
+    async def _camera_status(self, cam, **extra):
+        await self.broadcast({
+            "type": "camera_status", "session": cam.name,
+            "active": cam.on, "state": cam.state, **extra,
+        })
+
+    async def _open_camera(self, cam, ws=None):
+        """Open a session's camera and start its frame loop. Returns whether it opened."""
+        cam.started_at = time.perf_counter()
+        index = cam.config.get("index", 0)
+        capture = await self._open_capture_async(cam)
+        if capture is not None:
+            if cam.detector is None:
+                # Only extra sessions get here; the default one was warmed up
+                cam.detector = await asyncio.get_event_loop().run_in_executor(
+                    cam.worker, HandDetector)
+            cam.frame_latency.clear()
+            cam.backoff = 0.0
+            self._attach_capture(cam, capture)
+            cam.on = True
+            cam.task = asyncio.create_task(self.camera_loop(cam))
+            await self._camera_status(cam)
+            log.info("Camera '%s' started (device %s)", cam.name, index)
+            return True
+        msg = {"type": "error", "session": cam.name, "message": f"Could not open camera {index}"}
+        if ws:
+            await ws.send(json.dumps(msg))
         else:
-            msg = {"type": "error", "message": "Could not open camera"}
-            if ws:
-                await ws.send(json.dumps(msg))
+            await self.broadcast(msg)
+        return False
+
+    async def _drop_camera(self, cam):
+        """Release an extra session entirely; the default keeps its warm detector."""
+        if cam.name == DEFAULT_CAMERA:
+            return
+        self.cameras.pop(cam.name, None)
+        self.classifier.drop_cache(cam.cache)
+        await asyncio.get_event_loop().run_in_executor(self.pool, cam.shutdown)
+
+    async def _reconfigure_camera(self, cam, changes, previous_index, ws):
+        """Warm restart: apply new settings without stopping the loop or detector.
+
+        Resolution / fps / codec are re-applied to the open device; only a new
+        ``index`` opens another device, and the old one is kept if that fails.
+        """
+        if not changes or cam.state == "recovering":
+            # Nothing to apply, or the watchdog is reopening with the new config anyway
+            await self._camera_status(cam)
+            return
+        t0 = time.perf_counter()
+        loop = asyncio.get_event_loop()
+        # Blocking device work runs on the session's worker, which has no
+        # frames to process while the grabber is detached
+        capture, grabber = self._detach_capture(cam)
+        reconfigure = True
+        if "index" in changes:
+            opened = await self._open_capture_async(cam)
+            if opened is not None:
+                self._release_capture(capture, grabber)
+                capture, reconfigure = opened, False  # configured as it was opened
             else:
-                await self.broadcast(msg)
+                cam.config["index"] = previous_index
+                msg = f"Could not open camera {changes['index']}; keeping camera {previous_index}"
+                await ws.send(json.dumps({"type": "error", "session": cam.name, "message": msg}))
+        if reconfigure:
+            # The old grab thread must be out of the driver before the handle is reused
+            free = grabber is None or await loop.run_in_executor(cam.worker, grabber.join, CAMERA_GRAB_WAIT)
+            if not free:
+                self._release_capture(capture, grabber)
+                self._ensure_camera_loop(cam)
+                await self._recover_camera(cam, f"grab still running {CAMERA_GRAB_WAIT:g} s after reconfigure")
+                return
+            await loop.run_in_executor(cam.worker, self._configure_capture, capture, cam.config)
+        self._attach_capture(cam, capture)
+        self._ensure_camera_loop(cam)
+        elapsed = round((time.perf_counter() - t0) * 1000, 1)
+        self.M_CAMERA_RECOVERY.observe(elapsed)
+        log.info("Camera '%s' reconfigured in %.0f ms (%s)", cam.name, elapsed, ", ".join(changes))
+        await self._camera_status(cam, restartMs=elapsed)
+
+    def _ensure_camera_loop(self, cam):
+        """Frames must keep flowing after a settings change: restart a loop that stopped."""
+        if cam.on and (cam.task is None or cam.task.done()):
+            log.warning("Camera '%s' loop had stopped during reconfigure; restarting it", cam.name)
+            cam.task = asyncio.create_task(self.camera_loop(cam))
+
+    async def _recover_camera(self, cam, reason):
+        """Reopen a stalled or failing device, backing off while it stays unavailable.
+
+        Runs inside the session's camera loop, so nothing else touches the
+        device meanwhile; the detector and worker are reused.
+        """
+        log.warning("Camera '%s' %s — reopening", cam.name, reason)
+        t0 = time.perf_counter()
+        cam.restarts += 1
+        self.M_CAMERA_RESTARTS.inc()
+        cam.state = "recovering"
+        attempt = 0
+        while cam.on:
+            self._detach_capture(cam, release=True)
+            cam.state = "recovering"
+            await self._camera_status(cam, reason=reason, attempt=attempt, retryInMs=round(cam.backoff * 1000))
+            if cam.backoff:
+                await asyncio.sleep(cam.backoff)
+            cam.backoff = min(CAMERA_BACKOFF_MAX, max(CAMERA_BACKOFF_MIN, cam.backoff * 2))
+            attempt += 1
+            capture = await self._open_capture_async(cam)
+            if capture is None:
+                continue
+            if not cam.on:
+                self._release_capture(capture)
+                return
+            self._attach_capture(cam, capture)
+            cam.last_recovery_ms = round((time.perf_counter() - t0) * 1000, 1)
+            self.M_CAMERA_RECOVERY.observe(cam.last_recovery_ms)
+            log.info("Camera '%s' reopened after %.0f ms (attempt %d)",
+                     cam.name, cam.last_recovery_ms, attempt)
+            await self._camera_status(cam, recoveredMs=cam.last_recovery_ms)
+            return
 
-    async def _close_camera(self):
-        """Close the camera and stop the frame loop."""
-        self.camera_on = False
-        if self.camera_task:
+    async def _close_camera(self, cam):
+        """Close a session's camera and stop its frame loop."""
+        cam.on = False
+        # Stopping the grabber wakes a frame read the loop may be waiting on; the
+        # device is released off the event loop, after any grab in progress
+        self._detach_capture(cam, release=True)
+        if cam.task:
             try:
-                await asyncio.wait_for(self.camera_task, timeout=2.0)
+                await asyncio.wait_for(cam.task, timeout=2.0)
             except asyncio.TimeoutError:
                 pass
-        if self.camera:
-            self.camera.release()
-            self.camera = None
-        await self.broadcast({"type": "camera_status", "active": False})
-        log.info("Camera stopped")
+            cam.task = None
+        cam.close()
+        await self._camera_status(cam)
+        log.info("Camera '%s' stopped", cam.name)
 
     async def run(self, host="0.0.0.0", port=8765):
-        """Start the WebSocket server."""
+        """Start the WebSocket server, then warm up in the background."""
+        import websockets
+        self.ready = asyncio.Event()
         log.info("Starting WebSocket server on ws://%s:%d", host, port)
         async with websockets.serve(self.handler, host, port):
-            await asyncio.Future()  # run forever
+            self._mark("listeningMs")
+            warm_task = asyncio.create_task(self.warm_up())
+            try:
+                await asyncio.Future()  # run forever
+            finally:
+                warm_task.cancel()
 
 # ---------------------------------------------------------------------------
 # Entry point
 # ---------------------------------------------------------------------------
 if __name__ == "__main__":
+    if sys.argv[1:2] == ["replay"]:
+        # python gesture_service.py replay <flight_*.npz> [model_dir]
+        if len(sys.argv) < 3:
+            sys.exit("usage: gesture_service.py replay <flight dump> [model dir]")
+        model = KNNModel.load(sys.argv[3]) if len(sys.argv) > 3 else None
+        print(json.dumps(replay_flight(sys.argv[2], model), indent=2))
+        sys.exit(0)
     service = GestureService()
     try:
         asyncio.run(service.run())
     except KeyboardInterrupt:
         log.info("Shutting down...")
     finally:
-        if service.camera:
-            service.camera.release()
-        service.detector.close()
+        for cam in service.cameras.values():
+            cam.on = False
+            cam.shutdown()
@@ -25,23 +25,156 @@ if (!fs.existsSync(GESTURES_SAMPLES_DIR))
 
 // ---------------------------------------------------------------------------
 // Gesture persistence
+//
+// The bridge is the only writer of gestures.json. Edits bump an in-memory
+// version and schedule a debounced write (tmp file + rename, so readers never
+// see a truncated file); the ML service receives each edit tagged with the
+// version and is re-synced in one message whenever the versions disagree.
 // ---------------------------------------------------------------------------
+const GESTURE_SAVE_DEBOUNCE_MS = 250;
+
 function loadGestures() {
     try {
         if (fs.existsSync(GESTURES_FILE)) {
-            return JSON.parse(fs.readFileSync(GESTURES_FILE, "utf-8"));
+            const stored = JSON.parse(fs.readFileSync(GESTURES_FILE, "utf-8"));
+            // Older files are a bare { id: gesture } map
+            if (stored && typeof stored.version === "number" && stored.gestures) {
+                return { version: stored.version, gestures: stored.gestures };
+            }
+            return { version: 0, gestures: stored || {} };
         }
     } catch (e) {
         console.error("[API] Failed to load gestures:", e.message);
     }
-    return {};
+    return { version: 0, gestures: {} };
+}
+
+const loaded = loadGestures();
+let gestures = loaded.gestures;
+let gesturesVersion = loaded.version;
+let saveTimer = null;
+let saving = null; // promise of the write in flight
+let savedVersion = gesturesVersion;
+
+function serializeGestures() {
+    return JSON.stringify({ version: gesturesVersion, gestures }, null, 2);
+}
+
+async function writeGestures() {
+    const version = gesturesVersion;
+    const tmp = `${GESTURES_FILE}.${process.pid}.tmp`;
+    await fs.promises.writeFile(tmp, serializeGestures(), "utf-8");
+    await fs.promises.rename(tmp, GESTURES_FILE);
+    savedVersion = version;
+}
+
+function scheduleGestureSave() {
+    if (saveTimer) return;
+    saveTimer = setTimeout(async () => {
+        saveTimer = null;
+        while (saving) await saving; // never two writers on the same tmp file
+        if (savedVersion === gesturesVersion) return;
+        saving = writeGestures()
+            .catch((e) => console.error("[API] Failed to save gestures:", e.message))
+            .finally(() => {
+                saving = null;
+            });
+    }, GESTURE_SAVE_DEBOUNCE_MS);
+}
+
+/** Record an edit: bump the version, tell the ML service, persist (debounced). */
+function commitGestures(mlMessage) {
+    gesturesVersion++;
+    if (mlMessage) sendToML({ ...mlMessage, version: gesturesVersion });
+    scheduleGestureSave();
+    broadcastToClients({ type: "gesture_updated", gestures, version: gesturesVersion });
+}
+
+function syncGesturesToML() {
+    sendToML({ type: "sync_gestures", version: gesturesVersion, gestures });
+}
+
+// Flush a pending debounced write on shutdown
+function flushGesturesSync() {
+    if (savedVersion === gesturesVersion) return;
+    const tmp = `${GESTURES_FILE}.${process.pid}.tmp`;
+    fs.writeFileSync(tmp, serializeGestures(), "utf-8");
+    fs.renameSync(tmp, GESTURES_FILE);
+    savedVersion = gesturesVersion;
 }
 
-function saveGestures(gestures) {
-    fs.writeFileSync(GESTURES_FILE, JSON.stringify(gestures, null, 2), "utf-8");
+for (const signal of ["SIGINT", "SIGTERM"]) {
+    process.on(signal, () => {
+        try {
+            flushGesturesSync();
+        } catch (e) {
+            console.error("[API] Failed to flush gestures:", e.message);
+        }
+        process.exit(0);
+    });
 }
 
-let gestures = loadGestures();
+// ---------------------------------------------------------------------------
+// Relay metrics (same snapshot shape as the ML service's registry)
+// ---------------------------------------------------------------------------
+const bridgeMetrics = {
+    counters: {
+        ml_messages_in_total: 0,
+        ml_bytes_in_total: 0,
+        ml_frames_in_total: 0,
+        ml_commands_out_total: 0,
+        ml_commands_dropped_total: 0,
+        client_messages_in_total: 0,
+        client_messages_out_total: 0,
+        client_bytes_out_total: 0,
+    },
+    gauges: { browser_clients: 0, ml_connected: 0 },
+    histograms: {},
+    help: {
+        ml_messages_in_total: "Messages received from the ML service",
+        ml_bytes_in_total: "Bytes received from the ML service",
+        ml_frames_in_total: "Camera frames received from the ML service",
+        ml_commands_out_total: "Commands relayed to the ML service",
+        ml_commands_dropped_total: "Commands dropped while the ML service was unreachable",
+        client_messages_in_total: "Messages received from browser clients",
+        client_messages_out_total: "Messages sent to browser clients",
+        client_bytes_out_total: "Bytes sent to browser clients",
+        browser_clients: "Connected browser clients",
+        ml_connected: "1 while the ML service connection is open",
+    },
+};
+
+/** Render a metrics snapshot in the Prometheus text exposition format. */
+function renderPrometheus(prefix, snapshot) {
+    const lines = [];
+    const help = snapshot.help || {};
+    const emit = (name, type, samples) => {
+        const full = `${prefix}_${name}`;
+        if (help[name]) lines.push(`# HELP ${full} ${help[name]}`);
+        lines.push(`# TYPE ${full} ${type}`);
+        for (const [suffix, labels, value] of samples) {
+            lines.push(`${full}${suffix}${labels} ${value}`);
+        }
+    };
+    for (const [name, value] of Object.entries(snapshot.counters || {})) {
+        emit(name, "counter", [["", "", value]]);
+    }
+    for (const [name, value] of Object.entries(snapshot.gauges || {})) {
+        emit(name, "gauge", [["", "", value]]);
+    }
+    for (const [name, h] of Object.entries(snapshot.histograms || {})) {
+        let cumulative = 0;
+        const samples = h.buckets.map((bound, i) => {
+            cumulative += h.counts[i];
+            return ["_bucket", `{le="${bound}"}`, cumulative];
+        });
+        samples.push(["_bucket", '{le="+Inf"}', h.count]);
+        samples.push(["_sum", "", h.sum]);
+        samples.push(["_count", "", h.count]);
+        emit(name, "histogram", samples);
+    }
+    return lines.join("\n") + "\n";
+}
 
 // ---------------------------------------------------------------------------
 // Express App
@@ -58,7 +191,7 @@ const server = http.createServer(app);
 
 // GET /api/gestures — list all gestures
 app.get("/api/gestures", (req, res) => {
-    res.json({ gestures });
+    res.json({ gestures, version: gesturesVersion });
 });
 
 // POST /api/gestures — add a new gesture
@@ -83,13 +216,7 @@ app.post("/api/gestures", (req, res) => {
     }
     
     gestures[id] = gesture;
-    saveGestures(gestures);
-
-    // Notify ML service
-    sendToML({ type: "add_gesture", id, data: gesture });
-
-    // Broadcast to all browser clients
-    broadcastToClients({ type: "gesture_updated", gestures });
+    commitGestures({ type: "add_gesture", id, data: gesture });
 
     res.status(201).json({ id, gesture });
 });
@@ -109,13 +236,7 @@ app.patch("/api/gestures/:id", (req, res) => {
     if (action) gestures[id].action = action;
     if (cursorAction) gestures[id].cursorAction = cursorAction;
     
-    saveGestures(gestures);
-
-    // Notify ML service
-    sendToML({ type: "update_gesture", id, data: gestures[id] });
-
-    // Broadcast to all browser clients
-    broadcastToClients({ type: "gesture_updated", gestures });
+    commitGestures({ type: "update_gesture", id, data: gestures[id] });
 
     res.json({ id, gesture: gestures[id] });
 });
@@ -127,7 +248,6 @@ app.delete("/api/gestures/:id", (req, res) => {
         return res.status(404).json({ error: "Gesture not found" });
     }
     delete gestures[id];
-    saveGestures(gestures);
 
     // Delete sample files
     const sampleDir = path.join(GESTURES_SAMPLES_DIR, id);
@@ -135,11 +255,7 @@ app.delete("/api/gestures/:id", (req, res) => {
         fs.rmSync(sampleDir, { recursive: true, force: true });
     }
 
-    // Notify ML service
-    sendToML({ type: "delete_gesture", id });
-
-    // Broadcast
-    broadcastToClients({ type: "gesture_updated", gestures });
+    commitGestures({ type: "delete_gesture", id });
 
     res.json({ success: true });
 });
@@ -152,55 +268,136 @@ app.patch("/api/gestures/:id/toggle", (req, res) => {
         return res.status(404).json({ error: "Gesture not found" });
     }
     gestures[id].active = active !== undefined ? active : !gestures[id].active;
-    saveGestures(gestures);
-
-    sendToML({ type: "toggle_gesture", id, active: gestures[id].active });
-    broadcastToClients({ type: "gesture_updated", gestures });
+    commitGestures({ type: "toggle_gesture", id, active: gestures[id].active });
 
     res.json({ id, active: gestures[id].active });
 });
 
 // POST /api/camera/start — start the camera
+// Optional body: { session, index, width, height, fps, fourcc } capture settings;
+// a new session name opens an additional camera alongside the default one
 app.post("/api/camera/start", (req, res) => {
-    sendToML({ type: "camera_start" });
+    sendToML({ ...(req.body || {}), type: "camera_start" });
     res.json({ status: "starting" });
 });
 
 // POST /api/camera/stop — stop the camera
+// Optional body: { session } (defaults to the default camera)
 app.post("/api/camera/stop", (req, res) => {
-    sendToML({ type: "camera_stop" });
+    sendToML({ type: "camera_stop", session: req.body?.session });
     res.json({ status: "stopping" });
 });
 
 // POST /api/train — trigger model retraining
+// Optional body: { augment: <variants per sample>, mirror: <bool>, shadow: <bool> }
+// With shadow the new model runs beside the active one until promoted
 app.post("/api/train", (req, res) => {
-    sendToML({ type: "retrain" });
+    sendToML({ ...(req.body || {}), type: "retrain" });
     res.json({ status: "training" });
 });
 
+// POST /api/model/shadow — shadow a saved model directory. Body: { path }
+app.post("/api/model/shadow", (req, res) => {
+    const { path: modelPath } = req.body || {};
+    if (!modelPath) {
+        return res.status(400).json({ error: "path is required" });
+    }
+    sendToML({ type: "shadow_model", path: modelPath });
+    res.json({ status: "loading" });
+});
+
+// POST /api/model/shadow/stop — discard the candidate model
+app.post("/api/model/shadow/stop", (req, res) => {
+    sendToML({ type: "stop_shadow" });
+    res.json({ status: "stopped" });
+});
+
+// POST /api/model/promote — make the shadowed candidate the active model
+app.post("/api/model/promote", (req, res) => {
+    sendToML({ type: "promote_model" });
+    res.json({ status: "promoting" });
+});
+
+// POST /api/model/rollback — switch back to the model active before the last promotion
+app.post("/api/model/rollback", (req, res) => {
+    sendToML({ type: "rollback_model" });
+    res.json({ status: "rolling back" });
+});
+
 // POST /api/gestures/:id/record — start sample recording
 app.post("/api/gestures/:id/record", (req, res) => {
     const { id } = req.params;
     const total = req.body.total || 80;
+    const { minDistance, session } = req.body;
     if (!gestures[id]) {
         return res.status(404).json({ error: "Gesture not found" });
     }
-    sendToML({ type: "start_recording", id, total });
+    sendToML({ type: "start_recording", id, total, minDistance, session });
     res.json({ status: "recording", id, total });
 });
 
 // POST /api/gestures/:id/stop-record — stop sample recording
 app.post("/api/gestures/:id/stop-record", (req, res) => {
-    sendToML({ type: "stop_recording" });
+    sendToML({ type: "stop_recording", session: req.body?.session });
     res.json({ status: "stopped" });
 });
 
+// POST /api/gestures/:id/import — extract samples from video files / image folders
+// Body: { paths: [...], stride?: <every nth video frame>, minDistance?, flip? }
+// Paths are resolved on the machine running the ML service.
+app.post("/api/gestures/:id/import", (req, res) => {
+    const { id } = req.params;
+    const { paths, stride, minDistance, flip } = req.body || {};
+    if (!gestures[id]) {
+        return res.status(404).json({ error: "Gesture not found" });
+    }
+    if (!Array.isArray(paths) || paths.length === 0) {
+        return res.status(400).json({ error: "paths must be a non-empty array" });
+    }
+    sendToML({ type: "import_samples", id, paths, stride, minDistance, flip });
+    res.json({ status: "importing", id });
+});
+
 // POST /api/settings — update ML settings
 app.post("/api/settings", (req, res) => {
     sendToML({ type: "update_settings", ...req.body });
     res.json({ status: "updated" });
 });
 
+// POST /api/profile/start — sample the running ML service for a bounded time
+// Optional body: { seconds: 1-120 (default 10), intervalMs: 1-100 (default 5) }
+app.post("/api/profile/start", (req, res) => {
+    sendToML({ ...(req.body || {}), type: "start_profile" });
+    res.json({ status: "profiling" });
+});
+
+// POST /api/profile/stop — end the profile early; the summary arrives as profile_complete
+app.post("/api/profile/stop", (req, res) => {
+    sendToML({ type: "stop_profile" });
+    res.json({ status: "stopping" });
+});
+
+// POST /api/flight/dump — save the flight recorder's last frames for offline replay
+// Optional body: { seconds } (default: everything still in the ring buffer)
+app.post("/api/flight/dump", (req, res) => {
+    sendToML({ type: "dump_flight", seconds: req.body?.seconds });
+    res.json({ status: "dumping" });
+});
+
+// GET /api/metrics — bridge + ML service metrics as JSON
+app.get("/api/metrics", async (req, res) => {
+    res.json({ bridge: bridgeMetrics, ml: await requestMLMetrics() });
+});
+
+// GET /metrics — the same metrics in Prometheus text format
+app.get("/metrics", async (req, res) => {
+    const ml = await requestMLMetrics();
+    let body = renderPrometheus("gesturectrl_bridge", bridgeMetrics);
+    body += `# TYPE gesturectrl_ml_up gauge\ngesturectrl_ml_up ${ml ? 1 : 0}\n`;
+    if (ml) body += renderPrometheus("gesturectrl_ml", ml);
+    res.type("text/plain; version=0.0.4").send(body);
+});
+
 // GET /api/stats — get ML stats
 app.get("/api/stats", (req, res) => {
     sendToML({ type: "get_stats" });
@@ -214,8 +411,109 @@ app.get("/api/stats", (req, res) => {
 const wss = new WebSocket.Server({ noServer: true });
 const clientSockets = new Set();
 
+// Topic subscriptions: a browser sends
+//   { type: "subscribe", topics: [...], previewFps?, previewWidth? }
+// to choose what it receives; until then it gets everything except the binary
+// landmark stream. The bridge forwards the union to the ML service, which skips
+// JPEG encoding when nobody wants previews; per-client preview rates are
+// enforced here. Messages without a topic (status, gestures, errors) go to all.
+const TOPICS = ["preview", "detections", "landmarks", "training", "stats"];
+const DEFAULT_SUBSCRIPTION = {
+    topics: new Set(TOPICS.filter((t) => t !== "landmarks")),
+    previewFps: null,
+    previewWidth: null,
+};
+const MESSAGE_TOPICS = {
+    detection: "detections",
+    recording_started: "training",
+    recording_progress: "training",
+    recording_stopped: "training",
+    train_progress: "training",
+    train_complete: "training",
+    import_progress: "training",
+    import_complete: "training",
+    stats: "stats",
+    profile_started: "stats",
+    profile_complete: "stats",
+    shadow_report: "stats",
+    flight_dump: "stats",
+};
+let mlSubscription = null; // last union sent to the ML service (JSON)
+
+function parseSubscription(data) {
+    const topics = Array.isArray(data.topics) ? data.topics : [];
+    const fps = Number(data.previewFps);
+    const width = Number(data.previewWidth);
+    return {
+        topics: new Set(topics.filter((t) => TOPICS.includes(t))),
+        previewFps: fps > 0 ? fps : null,
+        previewWidth: width >= 64 ? Math.round(width) : null,
+    };
+}
+
+function subscriptionOf(ws) {
+    return ws.subscription || DEFAULT_SUBSCRIPTION;
+}
+
+function updateMLSubscription(force = false) {
+    const topics = new Set();
+    let previewFps = 0;
+    let previewWidth = 0;
+    for (const ws of clientSockets) {
+        const sub = subscriptionOf(ws);
+        for (const topic of sub.topics) topics.add(topic);
+        if (sub.topics.has("preview")) {
+            // null = unthrottled / full size, which wins over any limit
+            previewFps = previewFps === null || sub.previewFps === null ? null : Math.max(previewFps, sub.previewFps);
+            previewWidth = previewWidth === null || sub.previewWidth === null ? null : Math.max(previewWidth, sub.previewWidth);
+        }
+    }
+    const message = {
+        type: "subscribe",
+        topics: [...topics].sort(),
+        previewFps: previewFps || null,
+        previewWidth: previewWidth || null,
+    };
+    const key = JSON.stringify(message);
+    if (!force && key === mlSubscription) return;
+    mlSubscription = key;
+    if (mlSocket && mlSocket.readyState === WebSocket.OPEN) sendToML(message);
+}
+
+// Remote camera sessions: every browser shares the one ML connection, so the
+// bridge namespaces session ids as "<clientId>:<session>" and routes replies back
+const remoteOwners = new Map(); // namespaced session id -> browser ws
+
+function namespaceRemote(ws, data) {
+    const session = `${ws.clientId}:${data.session || "default"}`;
+    if (data.type === "remote_start") {
+        remoteOwners.set(session, ws);
+        ws.remoteSessions.add(session);
+    }
+    return { ...data, session };
+}
+
+function routeRemoteReply(data) {
+    const owner = remoteOwners.get(data.session);
+    if (!owner) return;
+    const [, session] = data.session.split(/:(.*)/s);
+    if (data.type === "remote_session" && !data.active) {
+        remoteOwners.delete(data.session);
+        owner.remoteSessions.delete(data.session);
+    }
+    if (owner.readyState === WebSocket.OPEN) {
+        owner.send(JSON.stringify({ ...data, session }));
+    }
+}
+
 wss.on("connection", (ws) => {
+    ws.clientId = uuidv4().slice(0, 8);
+    ws.remoteSessions = new Set();
+    ws.subscription = null;
+    ws.lastPreviewAt = 0;
     clientSockets.add(ws);
+    updateMLSubscription();
+    bridgeMetrics.gauges.browser_clients = clientSockets.size;
     console.log(`[WS] Browser client connected (${clientSockets.size} total)`);
 
     // Send initial state
@@ -223,15 +521,26 @@ wss.on("connection", (ws) => {
         JSON.stringify({
             type: "connected",
             gestures,
+            version: gesturesVersion,
             mlConnected: mlSocket !== null && mlSocket.readyState === WebSocket.OPEN,
+            state: mlState,
         })
     );
 
     ws.on("message", (raw) => {
+        bridgeMetrics.counters.client_messages_in_total++;
         // Forward commands to ML service
         try {
             const data = JSON.parse(raw.toString());
-            sendToML(data);
+            if (data.type === "subscribe") {
+                ws.subscription = parseSubscription(data);
+                ws.lastPreviewAt = 0;
+                const { topics, ...rates } = ws.subscription;
+                ws.send(JSON.stringify({ type: "subscribed", topics: [...topics], ...rates }));
+                updateMLSubscription();
+                return;
+            }
+            sendToML(data.type?.startsWith("remote_") ? namespaceRemote(ws, data) : data);
         } catch (e) {
             console.error("[WS] Invalid message from client:", e.message);
         }
@@ -239,17 +548,54 @@ wss.on("connection", (ws) => {
 
     ws.on("close", () => {
         clientSockets.delete(ws);
+        for (const session of ws.remoteSessions) {
+            remoteOwners.delete(session);
+            sendToML({ type: "remote_stop", session });
+        }
+        bridgeMetrics.gauges.browser_clients = clientSockets.size;
+        updateMLSubscription();
         console.log(
             `[WS] Browser client disconnected (${clientSockets.size} remaining)`
         );
     });
 });
 
-function broadcastToClients(message) {
-    const data = JSON.stringify(message);
+function broadcastToClients(message, topic = null) {
+    relayToClients(JSON.stringify(message), topic);
+}
+
+function sendToClient(ws, data) {
+    if (ws.readyState !== WebSocket.OPEN) return;
+    ws.send(data);
+    bridgeMetrics.counters.client_messages_out_total++;
+    bridgeMetrics.counters.client_bytes_out_total += data.length;
+}
+
+function relayToClients(data, topic = null) {
+    for (const ws of clientSockets) {
+        if (topic && !subscriptionOf(ws).topics.has(topic)) continue;
+        sendToClient(ws, data);
+    }
+}
+
+// A preview frame goes to clients whose preview is due at their rate; other
+// clients that want detections get only the detection carried in it
+function relayFrame(msgStr, data) {
+    const now = Date.now();
+    let detection = null;
     for (const ws of clientSockets) {
-        if (ws.readyState === WebSocket.OPEN) {
-            ws.send(data);
+        const sub = subscriptionOf(ws);
+        if (sub.topics.has("preview") && (!sub.previewFps || now - ws.lastPreviewAt >= 1000 / sub.previewFps)) {
+            ws.lastPreviewAt = now;
+            sendToClient(ws, msgStr);
+        } else if (data.detection && sub.topics.has("detections")) {
+            detection = detection || JSON.stringify({
+                type: "detection",
+                session: data.session,
+                detection: data.detection,
+                latencyMs: data.latencyMs,
+            });
+            sendToClient(ws, detection);
         }
     }
 }
@@ -258,6 +604,7 @@ function broadcastToClients(message) {
 // WebSocket — ML Service Connection (Python)
 // ---------------------------------------------------------------------------
 let mlSocket = null;
+let mlState = null; // "warming" | "ready" | "error" as reported by the ML service
 let mlReconnectTimer = null;
 const ML_WS_URL = "ws://localhost:8765";
 
@@ -275,50 +622,101 @@ function connectToML() {
 
     mlSocket.on("open", () => {
         console.log("[ML] ✓ Connected to Python ML service");
+        bridgeMetrics.gauges.ml_connected = 1;
         broadcastToClients({ type: "ml_status", connected: true });
-
-        // Re-sync gestures to ML
-        for (const [id, data] of Object.entries(gestures)) {
-            sendToML({ type: "add_gesture", id, data });
-        }
+        updateMLSubscription(true);
+        // Gesture sync waits for the ML handshake, which carries its version
     });
 
-    mlSocket.on("message", (raw) => {
+    mlSocket.on("message", (raw, isBinary) => {
+        bridgeMetrics.counters.ml_messages_in_total++;
+        bridgeMetrics.counters.ml_bytes_in_total += raw.length;
+
+        // Binary messages are quantised landmark packets
+        if (isBinary) {
+            relayToClients(raw, "landmarks");
+            return;
+        }
         const msgStr = raw.toString();
+        let topic = null;
 
         // Forward frame events directly to clients without re-parsing for speed
         // But parse non-frame events to handle them
         try {
             const data = JSON.parse(msgStr);
 
+            // Track ML warm-up state; the ML handshake itself isn't for browsers
+            if (data.type === "connected") {
+                mlState = data.state || null;
+                if (data.gesturesVersion !== gesturesVersion) {
+                    console.log(
+                        `[ML] Gestures at v${data.gesturesVersion}, bridge at v${gesturesVersion} — syncing`
+                    );
+                    syncGesturesToML();
+                }
+                broadcastToClients({ type: "ml_status", connected: true, state: mlState });
+                return;
+            }
+            if (data.type === "service_status") {
+                mlState = data.state;
+            }
+            if (data.type === "frame") {
+                bridgeMetrics.counters.ml_frames_in_total++;
+                relayFrame(msgStr, data);
+                return;
+            }
+
+            // Remote-session replies (and errors about a remote session) go only
+            // to the browser that owns the session, or nowhere once it has ended
+            if (
+                data.type === "remote_detection" ||
+                data.type === "remote_session" ||
+                (data.type === "error" && data.remote)
+            ) {
+                routeRemoteReply(data);
+                return;
+            }
+
+            // Metrics replies answer pending HTTP requests only
+            if (data.type === "metrics") {
+                resolveMLMetrics(data.metrics);
+                return;
+            }
+
+            // The ML service missed an edit (e.g. sent while it was down)
+            if (data.type === "request_gesture_sync") {
+                syncGesturesToML();
+                return;
+            }
+
             // Update local sample counts when recording completes
             if (data.type === "recording_progress" && data.id && gestures[data.id]) {
                 gestures[data.id].samples = data.recorded;
                 if (!data.active) {
-                    saveGestures(gestures);
+                    commitGestures({ type: "update_gesture", id: data.id, data: gestures[data.id] });
                 }
             }
 
-            // Forward stats to requesting client
-            if (data.type === "stats") {
-                broadcastToClients(data);
-                return;
+            if (data.type === "import_complete" && data.id && gestures[data.id]) {
+                gestures[data.id].samples = data.totalSamples;
+                commitGestures({ type: "update_gesture", id: data.id, data: gestures[data.id] });
             }
+
+            topic = MESSAGE_TOPICS[data.type] || null;
         } catch (e) {
             // If parsing fails, still forward
         }
 
-        // Forward everything to browser clients
-        for (const ws of clientSockets) {
-            if (ws.readyState === WebSocket.OPEN) {
-                ws.send(msgStr);
-            }
-        }
+        // Forward everything else to the browser clients subscribed to it
+        relayToClients(msgStr, topic);
     });
 
     mlSocket.on("close", () => {
         console.log("[ML] Disconnected from Python ML service");
         mlSocket = null;
+        mlState = null;
+        bridgeMetrics.gauges.ml_connected = 0;
+        resolveMLMetrics(null);
         broadcastToClients({ type: "ml_status", connected: false });
         scheduleMLReconnect();
     });
@@ -334,9 +732,48 @@ function connectToML() {
 function sendToML(message) {
     if (mlSocket && mlSocket.readyState === WebSocket.OPEN) {
         mlSocket.send(JSON.stringify(message));
-    } else {
-        console.warn("[ML] Not connected — command dropped:", message.type);
+        bridgeMetrics.counters.ml_commands_out_total++;
+        return true;
     }
+    bridgeMetrics.counters.ml_commands_dropped_total++;
+    console.warn("[ML] Not connected — command dropped:", message.type);
+    return false;
+}
+
+// Concurrent scrapes share one get_metrics round trip. A request the ML
+// service hasn't answered yet (e.g. queued behind a slow command) is not
+// repeated until ML_METRICS_RESEND_MS, so timed-out scrapes don't pile up.
+const ML_METRICS_TIMEOUT_MS = 1000;
+const ML_METRICS_RESEND_MS = 10000;
+let mlMetricsWaiters = [];
+let mlMetricsSentAt = 0;
+
+function requestMLMetrics() {
+    return new Promise((resolve) => {
+        mlMetricsWaiters.push(resolve);
+        const now = Date.now();
+        if (now - mlMetricsSentAt >= ML_METRICS_RESEND_MS) {
+            if (!sendToML({ type: "get_metrics" })) {
+                resolveMLMetrics(null);
+                return;
+            }
+            mlMetricsSentAt = now;
+        }
+        setTimeout(() => {
+            const i = mlMetricsWaiters.indexOf(resolve);
+            if (i !== -1) {
+                mlMetricsWaiters.splice(i, 1);
+                resolve(null);
+            }
+        }, ML_METRICS_TIMEOUT_MS);
+    });
+}
+
+function resolveMLMetrics(metrics) {
+    mlMetricsSentAt = 0;
+    const waiters = mlMetricsWaiters;
+    mlMetricsWaiters = [];
+    for (const resolve of waiters) resolve(metrics);
 }
 
 function scheduleMLReconnect() {